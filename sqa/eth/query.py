@@ -231,7 +231,7 @@ QUERY_SCHEMA = _QuerySchema()
 
 _blocks_table = Table(
     name='blocks',
-    primary_key=[],
+    primary_key=(),
     column_weights={
         'logs_bloom': 512,
         'extra_data': 'extra_data_size'
@@ -241,7 +241,7 @@ _blocks_table = Table(
 
 _tx_table = Table(
     name='transactions',
-    primary_key=['transaction_index'],
+    primary_key=('transaction_index',),
     column_weights={
         'input': 'input_size'
     }
@@ -250,7 +250,7 @@ _tx_table = Table(
 
 _logs_table = Table(
     name='logs',
-    primary_key=['log_index'],
+    primary_key=('log_index',),
     column_weights={
         'data': 'data_size'
     }
@@ -259,7 +259,7 @@ _logs_table = Table(
 
 _traces_table = Table(
     name='traces',
-    primary_key=['transaction_index', 'trace_address'],
+    primary_key=('transaction_index', 'trace_address'),
     column_weights={
         'create_init': 'create_init_size',
         'create_result_code': 'create_result_code_size',
@@ -271,7 +271,7 @@ _traces_table = Table(
 
 _statediffs_table = Table(
     name='statediffs',
-    primary_key=['transaction_index', 'address', 'key'],
+    primary_key=('transaction_index', 'address', 'key'),
     column_weights={
         'prev': 'prev_size',
         'next': 'next_size'
@@ -287,7 +287,7 @@ class _BlockItem(Item):
         return 'blocks'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('block'), ['number', 'hash', 'parentHash'])
+        return get_selected_fields(fields.get('block'), ('number', 'hash', 'parentHash'))
 
     def project(self, fields: FieldSelection) -> str:
         def rewrite_timestamp(f: str):
@@ -324,7 +324,7 @@ class _TxItem(Item):
         return 'transactions'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('transaction'), ['transactionIndex'])
+        return get_selected_fields(fields.get('transaction'), ('transactionIndex',))
 
     def project(self, fields: FieldSelection) -> str:
         def rewrite_chain_id(f: str):
@@ -361,7 +361,7 @@ class _LogItem(Item):
         return 'logs'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('log'), ['logIndex', 'transactionIndex'])
+        return get_selected_fields(fields.get('log'), ('logIndex', 'transactionIndex'))
 
     def selected_columns(self, fields: FieldSelection) -> list[str]:
         columns = []
@@ -414,7 +414,7 @@ class _TraceItem(Item):
         return 'traces'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('trace'), ['transactionIndex', 'traceAddress', 'type'])
+        return get_selected_fields(fields.get('trace'), ('transactionIndex', 'traceAddress', 'type'))
 
     def project(self, fields: FieldSelection) -> str:
         selected = self.get_selected_fields(fields)
@@ -523,7 +523,7 @@ class _StateDiffItem(Item):
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
         return get_selected_fields(
             fields.get('stateDiff'),
-            ['transactionIndex', 'address', 'key', 'kind']
+            ('transactionIndex', 'address', 'key', 'kind')
         )
 
 
@@ -544,7 +544,7 @@ def _build_model():
         JoinRel(
             scan=tx_scan,
             include_flag_name='stateDiffs',
-            scan_columns=[],
+            scan_columns=(),
             query='SELECT * FROM statediffs i, s WHERE '
                   'i.block_number = s.block_number AND '
                   'i.transaction_index = s.transaction_index'
@@ -563,14 +563,14 @@ def _build_model():
         JoinRel(
             scan=log_scan,
             include_flag_name='transactionTraces',
-            scan_columns=['transaction_index'],
+            scan_columns=('transaction_index',),
             query='SELECT * FROM traces i, s WHERE '
                   'i.block_number = s.block_number AND '
                   'i.transaction_index = s.transaction_index'
         ),
         SubRel(
             scan=trace_scan,
-            scan_columns=['transaction_index', 'trace_address'],
+            scan_columns=('transaction_index', 'trace_address'),
             include_flag_name='subtraces'
         ),
         JoinRel(
@@ -604,7 +604,7 @@ def _build_model():
         JoinRel(
             scan=log_scan,
             include_flag_name='transactionLogs',
-            scan_columns=['transaction_index'],
+            scan_columns=('transaction_index',),
             query='SELECT * FROM logs i, s WHERE '
                   'i.block_number = s.block_number AND '
                   'i.transaction_index = s.transaction_index'
@@ -612,7 +612,7 @@ def _build_model():
         JoinRel(
             scan=trace_scan,
             include_flag_name='transactionLogs',
-            scan_columns=['transaction_index'],
+            scan_columns=('transaction_index',),
             query='SELECT * FROM logs i, s WHERE '
                   'i.block_number = s.block_number AND '
                   'i.transaction_index = s.transaction_index'
@@ -624,17 +624,17 @@ def _build_model():
         RefRel(
             scan=log_scan,
             include_flag_name='transaction',
-            scan_columns=['transaction_index']
+            scan_columns=('transaction_index',)
         ),
         RefRel(
             scan=trace_scan,
             include_flag_name='transaction',
-            scan_columns=['transaction_index']
+            scan_columns=('transaction_index',)
         ),
         RefRel(
             scan=state_diff_scan,
             include_flag_name='transaction',
-            scan_columns=['transaction_index']
+            scan_columns=('transaction_index',)
         )
     ])
 
@@ -230,7 +230,7 @@ QUERY_SCHEMA = _QuerySchema()
 
 _blocks_table = Table(
     name='blocks',
-    primary_key=[]
+    primary_key=()
 )
 
 
@@ -242,7 +242,7 @@ class _BlockItem(Item):
         return 'blocks'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('block'), ['number', 'hash'])
+        return get_selected_fields(fields.get('block'), ('number', 'hash'))
 
     def project(self, fields: FieldSelection) -> str:
         return json_project(self.get_selected_fields(fields), rewrite={
@@ -253,7 +253,7 @@ class _BlockItem(Item):
 
 _transactions_table = Table(
     name='transactions',
-    primary_key=['index'],
+    primary_key=('index',),
     column_weights={
         'input_asset_ids': 'input_asset_ids_size',
         'input_contracts': 'input_contracts_size',
@@ -285,7 +285,7 @@ class _TransactionItem(Item):
         return 'transactions'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('transaction'), ['index'])
+        return get_selected_fields(fields.get('transaction'), ('index',))
 
     def project(self, fields: FieldSelection) -> str:
         return json_project(self.get_selected_fields(fields), rewrite={
@@ -335,7 +335,7 @@ _OUTPUT_CONTRACT = '''
 
 _receipts_table = Table(
     name='receipts',
-    primary_key=['transaction_index', 'index'],
+    primary_key=('transaction_index', 'index'),
     column_weights={
         'data': 'data_size',
     }
@@ -362,7 +362,7 @@ class _ReceiptItem(Item):
         return 'receipts'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('receipt'), ['transactionIndex', 'index'])
+        return get_selected_fields(fields.get('receipt'), ('transactionIndex', 'index'))
 
     def project(self, fields: FieldSelection) -> str:
         return json_project(self.get_selected_fields(fields), rewrite={
@@ -387,7 +387,7 @@ class _ReceiptItem(Item):
 
 _inputs_table = Table(
     name='inputs',
-    primary_key=['transaction_index', 'index'],
+    primary_key=('transaction_index', 'index'),
     column_weights={
         'coinPredicate': 'coin_predicate_size',
         'messagePredicate': 'message_predicate_size',
@@ -419,7 +419,7 @@ class _InputItem(Item):
         return 'inputs'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('input'), ['transactionIndex', 'index', 'type'])
+        return get_selected_fields(fields.get('input'), ('transactionIndex', 'index', 'type'))
 
     def project(self, fields: FieldSelection) -> str:
         selected = self.get_selected_fields(fields)
@@ -441,7 +441,7 @@ class _InputItem(Item):
 
 _output_table = Table(
     name='outputs',
-    primary_key=['transaction_index', 'index']
+    primary_key=('transaction_index', 'index')
 )
 
 
@@ -464,7 +464,7 @@ class _OutputItem(Item):
         return 'outputs'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('output'), ['transactionIndex', 'index', 'type'])
+        return get_selected_fields(fields.get('output'), ('transactionIndex', 'index', 'type'))
 
     def project(self, fields: FieldSelection) -> str:
         selected = self.get_selected_fields(fields)
@@ -501,17 +501,17 @@ def _build_model():
         RefRel(
             scan=receipt_scan,
             include_flag_name='transaction',
-            scan_columns=['transaction_index'],
+            scan_columns=('transaction_index',),
         ),
         RefRel(
             scan=input_scan,
             include_flag_name='transaction',
-            scan_columns=['transaction_index'],
+            scan_columns=('transaction_index',),
         ),
         RefRel(
             scan=output_scan,
             include_flag_name='transaction',
-            scan_columns=['transaction_index']
+            scan_columns=('transaction_index',)
         )
     ])
 
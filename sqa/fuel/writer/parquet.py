@@ -4,7 +4,8 @@ from typing import Any
 import pyarrow
 
 from sqa.fs import Fs
-from sqa.writer.parquet import TableBuilder, Column, BaseParquetWriter, add_index_column, add_size_column
+from sqa.writer.parquet import TableBuilder, Column, BaseParquetWriter, add_index_column, add_size_column, \
+    ParallelWrites
 from .model import BlockHeader, Transaction, TransactionInput, TransactionOutput, Block, Receipt, \
     Policies, TransactionInputContract, OutputContract
 
@@ -475,106 +476,108 @@ def write_parquet(fs: Fs, tables: dict[str, pyarrow.Table]) -> None:
         'write_batch_size': 50
     }
 
-    transactions = tables['transactions']
-    transactions = transactions.sort_by([
-        ('type', 'ascending'),
-        ('block_number', 'ascending'),
-        ('index', 'ascending'),
-    ])
-    transactions = add_size_column(transactions, 'script_data')
-    transactions = add_size_column(transactions, 'raw_payload')
-    transactions = add_index_column(transactions)
-
-    fs.write_parquet(
-        'transactions.parquet',
-        transactions,
-        use_dictionary=['type'],
-        write_statistics=[
-            '_idx',
-            'type',
-            'block_number',
-            'index',
-        ],
-        row_group_size=10_000,
-        **kwargs
-    )
-
-    inputs = tables['inputs']
-    inputs = inputs.sort_by([
-        ('type', 'ascending'),
-        ('block_number', 'ascending'),
-        ('transaction_index', 'ascending'),
-        ('index', 'ascending')
-    ])
-    inputs = add_size_column(inputs, 'coin_predicate')
-    inputs = add_size_column(inputs, 'message_predicate')
-    inputs = add_index_column(inputs)
-
-    fs.write_parquet(
-        'inputs.parquet',
-        inputs,
-        use_dictionary=['type'],
-        write_statistics=[
-            '_idx',
-            'type',
-            'block_number',
-            'transaction_index',
-            'index'
-        ],
-        row_group_size=15_000,
-        **kwargs
-    )
-
-    outputs = tables['outputs']
-    outputs = outputs.sort_by([
-        ('type', 'ascending'),
-        ('block_number', 'ascending'),
-        ('transaction_index', 'ascending'),
-        ('index', 'ascending')
-    ])
-    outputs = add_index_column(outputs)
-
-    fs.write_parquet(
-        'outputs.parquet',
-        outputs,
-        use_dictionary=['type'],
-        write_statistics=[
-            '_idx',
-            'type',
-            'block_number',
-            'transaction_index',
-            'index'
-        ],
-        row_group_size=15_000,
-        **kwargs
-    )
-
-    receipts = tables['receipts']
-    receipts = receipts.sort_by([
-        ('receipt_type', 'ascending'),
-        ('contract', 'ascending'),
-        ('block_number', 'ascending'),
-        ('transaction_index', 'ascending'),
-        ('index', 'ascending')
-    ])
-    receipts = add_size_column(receipts, 'data')
-    receipts = add_index_column(receipts)
-
-    fs.write_parquet(
-        'receipts.parquet',
-        receipts,
-        use_dictionary=['receipt_type'],
-        write_statistics=[
-            '_idx',
-            'receipt_type',
-            'block_number',
-            'transaction_index',
-            'index'
-        ],
-        row_group_size=20_000,
-        **kwargs
-    )
-
+    with ParallelWrites(fs) as files:
+        transactions = tables['transactions']
+        transactions = transactions.sort_by([
+            ('type', 'ascending'),
+            ('block_number', 'ascending'),
+            ('index', 'ascending'),
+        ])
+        transactions = add_size_column(transactions, 'script_data')
+        transactions = add_size_column(transactions, 'raw_payload')
+        transactions = add_index_column(transactions)
+
+        files.write_parquet(
+            'transactions.parquet',
+            transactions,
+            use_dictionary=['type'],
+            write_statistics=[
+                '_idx',
+                'type',
+                'block_number',
+                'index',
+            ],
+            row_group_size=10_000,
+            **kwargs
+        )
+
+        inputs = tables['inputs']
+        inputs = inputs.sort_by([
+            ('type', 'ascending'),
+            ('block_number', 'ascending'),
+            ('transaction_index', 'ascending'),
+            ('index', 'ascending')
+        ])
+        inputs = add_size_column(inputs, 'coin_predicate')
+        inputs = add_size_column(inputs, 'message_predicate')
+        inputs = add_index_column(inputs)
+
+        files.write_parquet(
+            'inputs.parquet',
+            inputs,
+            use_dictionary=['type'],
+            write_statistics=[
+                '_idx',
+                'type',
+                'block_number',
+                'transaction_index',
+                'index'
+            ],
+            row_group_size=15_000,
+            **kwargs
+        )
+
+        outputs = tables['outputs']
+        outputs = outputs.sort_by([
+            ('type', 'ascending'),
+            ('block_number', 'ascending'),
+            ('transaction_index', 'ascending'),
+            ('index', 'ascending')
+        ])
+        outputs = add_index_column(outputs)
+
+        files.write_parquet(
+            'outputs.parquet',
+            outputs,
+            use_dictionary=['type'],
+            write_statistics=[
+                '_idx',
+                'type',
+                'block_number',
+                'transaction_index',
+                'index'
+            ],
+            row_group_size=15_000,
+            **kwargs
+        )
+
+        receipts = tables['receipts']
+        receipts = receipts.sort_by([
+            ('receipt_type', 'ascending'),
+            ('contract', 'ascending'),
+            ('block_number', 'ascending'),
+            ('transaction_index', 'ascending'),
+            ('index', 'ascending')
+        ])
+        receipts = add_size_column(receipts, 'data')
+        receipts = add_index_column(receipts)
+
+        files.write_parquet(
+            'receipts.parquet',
+            receipts,
+            use_dictionary=['receipt_type'],
+            write_statistics=[
+                '_idx',
+                'receipt_type',
+                'block_number',
+                'transaction_index',
+                'index'
+            ],
+            row_group_size=20_000,
+            **kwargs
+        )
+
+    # blocks.parquet marks the chunk as complete, so it is written only after all other tables
     blocks = tables['blocks']
 
     fs.write_parquet(
@@ -585,7 +588,7 @@ def write_parquet(fs: Fs, tables: dict[str, pyarrow.Table]) -> None:
 
 
 def _list_size(ls: list[str] | None) -> int:
-    return 0 if ls is None else sum(len(i) for i in ls)
+    return 0 if ls is None else len(''.join(ls))
 
 
 def _to_int(val: str | None) -> int | None:
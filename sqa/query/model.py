@@ -3,7 +3,7 @@ from typing import NamedTuple, Iterable, TypeVar, Generic, Protocol
 import pyarrow.dataset
 
 from sqa.layout import Partition
-from .util import to_snake_case, json_project
+from .util import to_snake_case, JsonProjection
 
 
 ColumnName = str
@@ -14,7 +14,7 @@ FieldSelection = dict[str, dict[str, bool]]
 
 class Table(NamedTuple):
     name: str
-    primary_key: list[ColumnName, ...]
+    primary_key: tuple[ColumnName, ...]
     column_weights: dict[ColumnName, ColumnName | int] = {}
 
 
@@ -51,19 +51,19 @@ class ItemSrc(Protocol):
 class RefRel(NamedTuple):
     scan: Scan
     include_flag_name: str
-    scan_columns: list[ColumnName]
+    scan_columns: tuple[ColumnName, ...]
 
 
 class JoinRel(NamedTuple):
     scan: Scan
     include_flag_name: str
     query: str
-    scan_columns: list[ColumnName] | None = None
+    scan_columns: tuple[ColumnName, ...] | None = None
 
 
 class SubRel(NamedTuple):
     scan: Scan
-    scan_columns: list[ColumnName]
+    scan_columns: tuple[ColumnName, ...]
     include_flag_name: str
 
 
@@ -86,7 +86,10 @@ class Item:
         return list(to_snake_case(f) for f in self.get_selected_fields(fields))
 
     def project(self, fields: FieldSelection) -> str:
-        return json_project(self.get_selected_fields(fields))
+        return _default_projection(self.get_selected_fields(fields))
+
+
+_default_projection = JsonProjection()
 
 
 Model = list[Scan | Item]
@@ -13,7 +13,7 @@ from . import MissingData
 from .model import RefRel, Scan, Item, Model, FieldSelection, Table, ScanData, \
     ItemSrcQuery, ColumnName, JoinRel, SubRel
 from .schema import ArchiveQuery
-from .util import Params, include_columns, json_project, project, join_condition
+from .util import Params, include_columns, json_project, project, join_condition, NOTHING, field_gte, field_lte
 
 
 ReqName = str
@@ -44,7 +44,7 @@ _ScanQueries = dict[ReqName, list[_ScanQuery]]
 class _ScanSrcQuery:
     def __init__(self, scan: Scan, idx: int):
         self.req_name = scan.request_name()
-        self.key = ['block_number'] + scan.table().primary_key
+        self.key = ['block_number', *scan.table().primary_key]
         self.idx = idx
 
     def fetch(self, _p: Partition, scan_data: ScanData) -> pyarrow.Table:
@@ -56,8 +56,8 @@ class _RefRelQuery:
     def __init__(self, item: Item, rel: RefRel, idx: int):
         self.req_name = rel.scan.request_name()
         self.idx = idx
-        self.scan_key = ['block_number'] + rel.scan_columns
-        self.item_key = ['block_number'] + item.table().primary_key
+        self.scan_key = ['block_number', *rel.scan_columns]
+        self.item_key = ['block_number', *item.table().primary_key]
         assert len(self.scan_key) == len(self.item_key)
 
     def fetch(self, _p: Partition, scan_data: ScanData) -> pyarrow.Table:
@@ -89,7 +89,7 @@ class _SubQuery:
     def __init__(self, item: Item, rel: SubRel, idx: int):
         self.req_name = rel.scan.request_name()
         self.item_table = item.table().name
-        self.item_key = ['block_number'] + rel.scan_columns
+        self.item_key = ['block_number', *rel.scan_columns]
         self.idx = idx
 
         group = self.item_key[0:-1]
@@ -399,6 +399,19 @@ class QueryPlan:
         return block_numbers
 
 
+def _conjunction(conditions: list[pyarrow.dataset.Expression]) -> pyarrow.dataset.Expression | None:
+    for c in conditions:
+        if c.equals(NOTHING):
+            return c
+    # combine conditions pairwise to get a balanced tree instead of a left-deep chain
+    while len(conditions) > 1:
+        pairs = [conditions[i] & conditions[i + 1] for i in range(0, len(conditions) - 1, 2)]
+        if len(conditions) % 2:
+            pairs.append(conditions[-1])
+        conditions = pairs
+    return conditions[0] if conditions else None
+
+
 class _Builder:
     scan_queries: _ScanQueries
     item_selection_queries: dict[ReqName, _ItemSelectionQuery]
@@ -434,22 +447,23 @@ class _Builder:
         req_name = scan.request_name()
         queries: list[_ScanQuery] = []
 
+        # the block range is the same for all requests of the query
+        block_range = [
+            c for c in (
+                field_gte('block_number', self.q['fromBlock']),
+                field_lte('block_number', self.q.get('toBlock'))
+            ) if c is not None
+        ]
+
         for i, req in enumerate(self.q.get(req_name, [])):
             where = [c for c in scan.where(req) if c is not None]
-            where.append(pyarrow.compute.field('block_number') >= self.q['fromBlock'])
-            if 'toBlock' in self.q:
-                where.append(pyarrow.compute.field('block_number') <= self.q['toBlock'])
-
-            if where:
-                filter_ = where[0]
-                for c in where[1:]:
-                    filter_ = filter_ & c
-            else:
-                filter_ = None
+            where.extend(block_range)
+
+            filter_ = _conjunction(where)
 
             q = _ScanQuery(
                 scan.table().name,
-                ['block_number'] + scan.table().primary_key,
+                ['block_number', *scan.table().primary_key],
                 filter_
             )
 
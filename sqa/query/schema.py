@@ -1,4 +1,4 @@
-from typing import TypedDict, NotRequired
+from typing import TypedDict, NotRequired, Callable, Any
 
 import marshmallow as mm
 import marshmallow.validate
@@ -31,9 +31,132 @@ class BaseQuerySchema(mm.Schema):
     includeAllBlocks = mm.fields.Boolean(required=False)
 
 
+class StrList(mm.fields.Field):
+    # Validates the whole list in one pass instead of dispatching to a nested field per element.
+    # Invalid input is re-validated by `List(String())` to report the same per-index errors.
+    _list = mm.fields.List(mm.fields.String())
+
+    def _deserialize(self, value, attr, data, **kwargs) -> list[str]:
+        if isinstance(value, list) and all(isinstance(s, str) for s in value):
+            return value
+        return self._list.deserialize(value, attr, data, **kwargs)
+
+
 def field_map_schema(typed_dict):
     return mm.fields.Dict(
         mm.fields.Str(validate=lambda k: k in typed_dict.__optional_keys__),
         mm.fields.Boolean(),
         required=False
     )
+
+
+class _Fallback(Exception):
+    pass
+
+
+def compile_schema(schema: mm.Schema) -> Callable[[Any], dict]:
+    """
+    Returns a loader equivalent to `schema.load(data, unknown=mm.RAISE)`.
+
+    Well-formed input is handled by a loader precompiled from the schema fields,
+    which skips marshmallow's generic per-field dispatch, while anything else
+    (including invalid input) goes through marshmallow for proper error messages.
+    """
+    fast_load = _compile_schema(schema)
+
+    def load(data: Any) -> dict:
+        if fast_load is not None:
+            try:
+                return fast_load(data)
+            except (_Fallback, mm.ValidationError):
+                pass
+        return schema.load(data, unknown=mm.RAISE)
+
+    return load
+
+
+def _compile_schema(schema: mm.Schema) -> Callable[[Any], dict] | None:
+    if schema.many or any(schema._hooks.values()):
+        return None
+
+    specs = []
+    for name, field in schema.load_fields.items():
+        if field.load_default is not mm.missing:
+            return None
+        load_field = _compile_field(field)
+        if load_field is None:
+            return None
+        specs.append((field.data_key or name, field.attribute or name, field.required, load_field))
+
+    def load(data: Any) -> dict:
+        if type(data) is not dict:
+            raise _Fallback
+        result = {}
+        for key, attr, required, load_field in specs:
+            value = data.get(key, mm.missing)
+            if value is mm.missing:
+                if required:
+                    raise _Fallback
+            else:
+                result[attr] = load_field(value)
+        if len(result) != len(data):
+            raise _Fallback  # unknown fields
+        return result
+
+    return load
+
+
+def _compile_field(field: mm.fields.Field) -> Callable[[Any], Any] | None:
+    if field.validators:
+        if isinstance(field, (mm.fields.Nested, mm.fields.List)):
+            return None
+        return field.deserialize
+
+    if isinstance(field, mm.fields.Nested):
+        if field.many or not isinstance(field.schema, mm.Schema):
+            return None
+        return _compile_schema(field.schema)
+
+    if isinstance(field, mm.fields.List) and isinstance(field.inner, mm.fields.Nested):
+        load_item = _compile_field(field.inner)
+        if load_item is None:
+            return None
+
+        def load_list(value: Any) -> list:
+            if type(value) is not list:
+                raise _Fallback
+            return [load_item(v) for v in value]
+
+        return load_list
+
+    if type(field) is StrList:
+        def load_str_list(value: Any) -> list[str]:
+            if type(value) is not list:
+                raise _Fallback
+            for s in value:
+                if type(s) is not str:
+                    raise _Fallback
+            return value
+
+        return load_str_list
+
+    if isinstance(field, mm.fields.Dict) \
+            and type(field.key_field) is mm.fields.String \
+            and type(field.value_field) is mm.fields.Boolean \
+            and not field.value_field.validators:
+        validate_key = field.key_field.validators
+
+        def load_field_map(value: Any) -> dict:
+            if type(value) is not dict:
+                raise _Fallback
+            for k, v in value.items():
+                if type(k) is not str or type(v) is not bool:
+                    raise _Fallback
+                for validate in validate_key:
+                    if validate(k) is False:
+                        raise _Fallback
+            return dict(value)
+
+        return load_field_map
+
+    return field.deserialize
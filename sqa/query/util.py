@@ -1,3 +1,4 @@
+import functools
 import re
 from typing import Any, Iterable
 
@@ -40,13 +41,17 @@ def include_columns(columns: list[str], columns_to_include: Iterable[str] | None
             columns.append(c)
 
 
+@functools.cache
 def to_snake_case(name: str) -> str:
     name = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
     return re.sub('([a-z0-9])([A-Z])', r'\1_\2', name).lower()
 
 
 def remove_camel_prefix(name: str, prefix: str) -> str:
-    return name[len(prefix)].lower() + name[len(prefix) + 1:]
+    n = len(prefix)
+    if len(name) <= n:
+        raise ValueError(f'"{name}" has nothing after the "{prefix}" prefix')
+    return name[n].lower() + name[n + 1:]
 
 
 def project(columns: Iterable[str], prefix: str = '') -> str:
@@ -77,40 +82,77 @@ def json_project(fields: Iterable[str | tuple[str, str]], rewrite: dict[str, str
     return f'json_object({", ".join(props)})'
 
 
+class JsonProjection:
+    """
+    `json_project()` with a fixed rewrite map, memoized on the list of selected fields
+    """
+    def __init__(self, rewrite: dict[str, str] | None = None):
+        self._rewrite = rewrite
+        self._project = functools.lru_cache(maxsize=256)(self._build)
+
+    def __call__(self, fields: Iterable[str]) -> str:
+        return self._project(tuple(fields))
+
+    def _build(self, fields: tuple[str, ...]) -> str:
+        return json_project(fields, self._rewrite)
+
+
 def get_selected_fields(
         fields: dict[str, bool] | None,
-        required_fields: list[str] | None = None
+        required_fields: tuple[str, ...] = ()
 ) -> list[str]:
-    ls = list(required_fields) if required_fields else []
-    if fields:
-        include_columns(ls, (f for f, on in fields.items() if on))
-    return ls
+    return list(_get_selected_fields(
+        tuple(fields.items()) if fields else (),
+        tuple(required_fields)
+    ))
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_selected_fields(
+        fields: tuple[tuple[str, bool], ...],
+        required_fields: tuple[str, ...]
+) -> tuple[str, ...]:
+    ls = list(required_fields)
+    include_columns(ls, (f for f, on in fields if on))
+    return tuple(ls)
+
+
+@functools.cache
+def _field(name: str) -> pyarrow.dataset.Expression:
+    # column set is fixed by the models, so field references are created once per column
+    return pyarrow.compute.field(name)
+
+
+# predicate which matches nothing, produced for empty value lists
+NOTHING = pyarrow.compute.scalar(0) == pyarrow.compute.scalar(1)
 
 
-def field_in(field_name: str, value_list: list[Any] | None) -> pyarrow.dataset.Expression | None:
+def field_in(field_name: str, value_list: list[Any] | pyarrow.Array | None) -> pyarrow.dataset.Expression | None:
     if value_list is None:
         return
+    if len(value_list) > 1 and isinstance(value_list, list):
+        value_list = list(dict.fromkeys(value_list))
     if len(value_list) == 0:
-        return pyarrow.compute.scalar(0) == pyarrow.compute.scalar(1)
+        return NOTHING
     elif len(value_list) == 1:
-        return pyarrow.compute.field(field_name) == pyarrow.compute.scalar(value_list[0])
+        return _field(field_name) == pyarrow.compute.scalar(value_list[0])
     else:
-        return pyarrow.compute.field(field_name).isin(value_list)
+        return _field(field_name).isin(value_list)
 
 
 def field_gte(field_name: str, value: Any | None) -> pyarrow.dataset.Expression | None:
     if value is None:
         return
-    return pyarrow.compute.field(field_name) >= value
+    return _field(field_name) >= value
 
 
 def field_lte(field_name: str, value: Any | None) -> pyarrow.dataset.Expression | None:
     if value is None:
         return
-    return pyarrow.compute.field(field_name) <= value
+    return _field(field_name) <= value
 
 
 def field_eq(field_name: str, value: Any | None) -> pyarrow.dataset.Expression | None:
     if value is None:
         return
-    return pyarrow.compute.field(field_name) == value
+    return _field(field_name) == value
@@ -1,11 +1,12 @@
+import sys
 from typing import TypedDict, Literal, Iterable
 
 import marshmallow as mm
 import pyarrow
 
 from sqa.query.model import Table, Item, Scan, ReqName, JoinRel, RefRel
-from sqa.query.schema import field_map_schema, BaseQuerySchema
-from sqa.query.util import get_selected_fields, json_project, field_in, to_snake_case, field_eq
+from sqa.query.schema import field_map_schema, BaseQuerySchema, StrList
+from sqa.query.util import get_selected_fields, field_in, to_snake_case, field_eq, JsonProjection
 from sqa.solana.writer.model import Base58Bytes
 
 
@@ -89,6 +90,34 @@ class FieldSelection(TypedDict, total=False):
     reward: RewardFieldSelection
 
 
+_BASE58_ALPHABET = b'123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+
+def _validate_base58_list(values: list[str]) -> None:
+    if not values:
+        return
+    # single pass over all characters of the list instead of a per-item check
+    try:
+        invalid = ''.join(values).encode('ascii').translate(None, _BASE58_ALPHABET)
+    except UnicodeEncodeError:
+        invalid = True
+    if invalid:
+        raise mm.ValidationError('list contains invalid base58 strings')
+    lengths = set(map(len, values))
+    if min(lengths) < 32 or max(lengths) > 44:
+        raise mm.ValidationError('list contains strings which are not valid base58 encoded public keys')
+
+
+class _Base58List(StrList):
+    def _deserialize(self, value, attr, data, **kwargs) -> list[str]:
+        # account keys are heavily repeated across requests, keep a single copy of each
+        return [sys.intern(s) for s in super()._deserialize(value, attr, data, **kwargs)]
+
+
+def _base58_list():
+    return _Base58List(validate=_validate_base58_list)
+
+
 class _FieldSelectionSchema(mm.Schema):
     block = field_map_schema(BlockFieldSelection)
     transaction = field_map_schema(TransactionFieldSelection)
@@ -106,7 +135,7 @@ class TransactionRequest(TypedDict, total=False):
 
 
 class _TransactionRequestSchema(mm.Schema):
-    feePayer = mm.fields.List(mm.fields.Str())
+    feePayer = _base58_list()
     instructions = mm.fields.Boolean()
     logs = mm.fields.Boolean()
 
@@ -141,27 +170,27 @@ class InstructionRequest(TypedDict, total=False):
 
 
 class _InstructionRequestSchema(mm.Schema):
-    programId = mm.fields.List(mm.fields.Str())
-    d1 = mm.fields.List(mm.fields.Str())
-    d2 = mm.fields.List(mm.fields.Str())
-    d4 = mm.fields.List(mm.fields.Str())
-    d8 = mm.fields.List(mm.fields.Str())
-    a0 = mm.fields.List(mm.fields.Str())
-    a1 = mm.fields.List(mm.fields.Str())
-    a2 = mm.fields.List(mm.fields.Str())
-    a3 = mm.fields.List(mm.fields.Str())
-    a4 = mm.fields.List(mm.fields.Str())
-    a5 = mm.fields.List(mm.fields.Str())
-    a6 = mm.fields.List(mm.fields.Str())
-    a7 = mm.fields.List(mm.fields.Str())
-    a8 = mm.fields.List(mm.fields.Str())
-    a9 = mm.fields.List(mm.fields.Str())
-    a10 = mm.fields.List(mm.fields.Str())
-    a11 = mm.fields.List(mm.fields.Str())
-    a12 = mm.fields.List(mm.fields.Str())
-    a13 = mm.fields.List(mm.fields.Str())
-    a14 = mm.fields.List(mm.fields.Str())
-    a15 = mm.fields.List(mm.fields.Str())
+    programId = _base58_list()
+    d1 = StrList()
+    d2 = StrList()
+    d4 = StrList()
+    d8 = StrList()
+    a0 = _base58_list()
+    a1 = _base58_list()
+    a2 = _base58_list()
+    a3 = _base58_list()
+    a4 = _base58_list()
+    a5 = _base58_list()
+    a6 = _base58_list()
+    a7 = _base58_list()
+    a8 = _base58_list()
+    a9 = _base58_list()
+    a10 = _base58_list()
+    a11 = _base58_list()
+    a12 = _base58_list()
+    a13 = _base58_list()
+    a14 = _base58_list()
+    a15 = _base58_list()
     isCommitted = mm.fields.Boolean()
     transaction = mm.fields.Boolean()
     transactionTokenBalances = mm.fields.Boolean()
@@ -177,8 +206,8 @@ class LogRequest(TypedDict, total=False):
 
 
 class _LogRequestSchema(mm.Schema):
-    programId = mm.fields.List(mm.fields.Str())
-    kind = mm.fields.List(mm.fields.Str())
+    programId = _base58_list()
+    kind = StrList()
     transaction = mm.fields.Boolean()
     instruction = mm.fields.Boolean()
 
@@ -190,7 +219,7 @@ class BalanceRequest(TypedDict, total=False):
 
 
 class _BalanceRequestSchema(mm.Schema):
-    account = mm.fields.List(mm.fields.Str())
+    account = _base58_list()
     transaction = mm.fields.Boolean()
     transactionInstructions = mm.fields.Boolean()
 
@@ -208,13 +237,13 @@ class TokenBalanceRequest(TypedDict, total=False):
 
 
 class _TokenBalanceRequestSchema(mm.Schema):
-    account = mm.fields.List(mm.fields.Str())
-    preMint = mm.fields.List(mm.fields.Str())
-    postMint = mm.fields.List(mm.fields.Str())
-    preProgramId = mm.fields.List(mm.fields.Str())
-    postProgramId = mm.fields.List(mm.fields.Str())
-    preOwner = mm.fields.List(mm.fields.Str())
-    postOwner = mm.fields.List(mm.fields.Str())
+    account = _base58_list()
+    preMint = _base58_list()
+    postMint = _base58_list()
+    preProgramId = _base58_list()
+    postProgramId = _base58_list()
+    preOwner = _base58_list()
+    postOwner = _base58_list()
     transaction = mm.fields.Boolean()
     transactionInstructions = mm.fields.Boolean()
 
@@ -224,7 +253,7 @@ class RewardRequest(TypedDict, total=False):
 
 
 class _RewardRequestSchema(mm.Schema):
-    pubkey = mm.fields.List(mm.fields.Str())
+    pubkey = _base58_list()
 
 
 class _QuerySchema(BaseQuerySchema):
@@ -242,10 +271,15 @@ QUERY_SCHEMA = _QuerySchema()
 
 _blocks_table = Table(
     name='blocks',
-    primary_key=[]
+    primary_key=()
 )
 
 
+_block_projection = JsonProjection({
+    'timestamp': 'epoch(timestamp)::int8'
+})
+
+
 class _BlockItem(Item):
     def table(self) -> Table:
         return _blocks_table
@@ -254,17 +288,15 @@ class _BlockItem(Item):
         return 'blocks'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('block'), ['number', 'hash'])
+        return get_selected_fields(fields.get('block'), ('number', 'hash'))
 
     def project(self, fields: FieldSelection) -> str:
-        return json_project(self.get_selected_fields(fields), rewrite={
-            'timestamp': 'epoch(timestamp)::int8'
-        })
+        return _block_projection(self.get_selected_fields(fields))
 
 
 _transactions_table = Table(
     name='transactions',
-    primary_key=['transaction_index'],
+    primary_key=('transaction_index',),
     column_weights={
         'account_keys': 'account_keys_size',
         'address_table_lookups': 'address_table_lookups_size',
@@ -285,6 +317,14 @@ class _TransactionScan(Scan):
         yield field_in('fee_payer', req.get('feePayer'))
 
 
+_transaction_projection = JsonProjection({
+    'version': "if(version < 0, 'legacy'::json, version::json)",
+    'computeUnitsConsumed': 'compute_units_consumed::text',
+    'fee': 'fee::text',
+    'err': 'err::json'
+})
+
+
 class _TransactionItem(Item):
     def table(self) -> Table:
         return _transactions_table
@@ -293,43 +333,47 @@ class _TransactionItem(Item):
         return 'transactions'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('transaction'), ['transactionIndex'])
+        return get_selected_fields(fields.get('transaction'), ('transactionIndex',))
 
     def project(self, fields: FieldSelection) -> str:
-        return json_project(self.get_selected_fields(fields), rewrite={
-            'version': "if(version < 0, 'legacy'::json, version::json)",
-            'computeUnitsConsumed': 'compute_units_consumed::text',
-            'fee': 'fee::text',
-            'err': 'err::json'
-        })
+        return _transaction_projection(self.get_selected_fields(fields))
+
+
+# instruction accounts stored in dedicated columns, the rest goes to `rest_accounts`
+_ACCOUNT_COLUMNS = tuple(f'a{i}' for i in range(16))
 
 
 _instructions_table = Table(
     name='instructions',
-    primary_key=['transaction_index', 'instruction_address'],
+    primary_key=('transaction_index', 'instruction_address'),
     column_weights={
         'data': 'data_size',
+        **{a: 0 for a in _ACCOUNT_COLUMNS},
         'a0': 'accounts_size',  # hack, put all accounts weight to a single column
-        'a1': 0,
-        'a2': 0,
-        'a3': 0,
-        'a4': 0,
-        'a5': 0,
-        'a6': 0,
-        'a7': 0,
-        'a8': 0,
-        'a9': 0,
-        'a10': 0,
-        'a11': 0,
-        'a12': 0,
-        'a13': 0,
-        'a14': 0,
-        'a15': 0,
         'rest_accounts': 0,
     }
 )
 
 
+_INSTRUCTION_FIELD_COLUMNS = {
+    name: (to_snake_case(name),)
+    for name in ('transactionIndex', 'instructionAddress', *InstructionFieldSelection.__optional_keys__)
+}
+_INSTRUCTION_FIELD_COLUMNS['accounts'] = (*_ACCOUNT_COLUMNS, 'rest_accounts')
+
+
+_INSTRUCTION_ACCOUNTS_EXP = (
+    f'list_concat('
+    f'list_filter(list_value({", ".join(_ACCOUNT_COLUMNS)}), a -> a IS NOT NULL), '
+    f'rest_accounts)'
+)
+
+
+_instruction_projection = JsonProjection({
+    'accounts': _INSTRUCTION_ACCOUNTS_EXP
+})
+
+
 class _InstructionScan(Scan):
     def table(self) -> Table:
         return _instructions_table
@@ -338,30 +382,37 @@ class _InstructionScan(Scan):
         return 'instructions'
 
     def where(self, req: InstructionRequest) -> Iterable[pyarrow.dataset.Expression | None]:
-        yield field_in('program_id', req.get('programId'))
+        # The same key list is often given for several filters of a request,
+        # so the arrow value set is built for each distinct list only once.
+        value_sets = {}
+        yield field_in('program_id', _value_set(req.get('programId'), value_sets))
         yield field_in('d1', req.get('d1'))
         yield field_in('d2', req.get('d2'))
         yield field_in('d4', req.get('d4'))
         yield field_in('d8', req.get('d8'))
-        yield field_in('a0', req.get('a0'))
-        yield field_in('a1', req.get('a1'))
-        yield field_in('a2', req.get('a2'))
-        yield field_in('a3', req.get('a3'))
-        yield field_in('a4', req.get('a4'))
-        yield field_in('a5', req.get('a5'))
-        yield field_in('a6', req.get('a6'))
-        yield field_in('a7', req.get('a7'))
-        yield field_in('a8', req.get('a8'))
-        yield field_in('a9', req.get('a9'))
-        yield field_in('a10', req.get('a10'))
-        yield field_in('a11', req.get('a11'))
-        yield field_in('a12', req.get('a12'))
-        yield field_in('a13', req.get('a13'))
-        yield field_in('a14', req.get('a14'))
-        yield field_in('a15', req.get('a15'))
+        # `aN` filters are positional: account N of the instruction must be in the given list,
+        # and, like all other request filters, they are combined with AND.
+        for a in _ACCOUNT_COLUMNS:
+            yield field_in(a, _value_set(req.get(a), value_sets))
         yield field_eq('is_committed', req.get('isCommitted'))
 
 
+def _value_set(
+        values: list[Base58Bytes] | None,
+        cache: dict[tuple[Base58Bytes, ...], list[Base58Bytes] | pyarrow.Array]
+) -> list[Base58Bytes] | pyarrow.Array | None:
+    if not values or len(values) == 1:
+        return values
+    key = tuple(values)
+    value_set = cache.get(key)
+    if value_set is None:
+        value_set = list(dict.fromkeys(values))
+        if len(value_set) > 1:
+            value_set = pyarrow.array(value_set, type=pyarrow.string())
+        cache[key] = value_set
+    return value_set
+
+
 class _InstructionItem(Item):
     def table(self) -> Table:
         return _instructions_table
@@ -370,46 +421,18 @@ class _InstructionItem(Item):
         return 'instructions'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('instruction'), ['transactionIndex', 'instructionAddress'])
+        return get_selected_fields(fields.get('instruction'), ('transactionIndex', 'instructionAddress'))
 
     def selected_columns(self, fields: FieldSelection) -> list[str]:
-        columns = []
-        for name in self.get_selected_fields(fields):
-            if name == 'accounts':
-                columns.append('a0')
-                columns.append('a1')
-                columns.append('a2')
-                columns.append('a3')
-                columns.append('a4')
-                columns.append('a5')
-                columns.append('a6')
-                columns.append('a7')
-                columns.append('a8')
-                columns.append('a9')
-                columns.append('a10')
-                columns.append('a11')
-                columns.append('a12')
-                columns.append('a13')
-                columns.append('a14')
-                columns.append('a15')
-                columns.append('rest_accounts')
-            else:
-                columns.append(to_snake_case(name))
-        return columns
+        return [c for name in self.get_selected_fields(fields) for c in _INSTRUCTION_FIELD_COLUMNS[name]]
 
     def project(self, fields: FieldSelection) -> str:
-        return json_project(self.get_selected_fields(fields), rewrite={
-            'accounts': f'list_concat('
-                        f'[a for a in list_value('
-                        f'a0, a1, a2, a3, a4, a5, a6, a7, a8, a9, a10, a11, a12, a13, a14, a15'
-                        f') if a is not null], '
-                        f'rest_accounts)'
-        })
+        return _instruction_projection(self.get_selected_fields(fields))
 
 
 _logs_table = Table(
     name='logs',
-    primary_key=['transaction_index', 'log_index'],
+    primary_key=('transaction_index', 'log_index'),
     column_weights={
         'message': 'message_size'
     }
@@ -435,12 +458,12 @@ class _LogItem(Item):
         return 'logs'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('log'), ['transactionIndex', 'logIndex'])
+        return get_selected_fields(fields.get('log'), ('transactionIndex', 'logIndex'))
 
 
 _balance_table = Table(
     name='balances',
-    primary_key=['transaction_index', 'account']
+    primary_key=('transaction_index', 'account')
 )
 
 
@@ -455,6 +478,12 @@ class _BalanceScan(Scan):
         yield field_in('account', req.get('account'))
 
 
+_balance_projection = JsonProjection({
+    'pre': 'pre::text',
+    'post': 'post::text'
+})
+
+
 class _BalanceItem(Item):
     def table(self) -> Table:
         return _balance_table
@@ -463,21 +492,18 @@ class _BalanceItem(Item):
         return 'balances'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('balance'), ['transactionIndex', 'account'])
+        return get_selected_fields(fields.get('balance'), ('transactionIndex', 'account'))
 
     def project(self, fields: FieldSelection) -> str:
-        return json_project(self.get_selected_fields(fields), rewrite={
-            'pre': 'pre::text',
-            'post': 'post::text'
-        })
+        return _balance_projection(self.get_selected_fields(fields))
 
 
 _token_balance_table = Table(
     name='token_balances',
-    primary_key=[
+    primary_key=(
         'transaction_index',
         'account'
-    ]
+    )
 )
 
 
@@ -498,6 +524,12 @@ class _TokenBalanceScan(Scan):
         yield field_in('postProgramId', req.get('postProgramId'))
 
 
+_token_balance_projection = JsonProjection({
+    'preAmount': 'pre_amount::text',
+    'postAmount': 'post_amount::text'
+})
+
+
 class _TokenBalanceItem(Item):
     def table(self) -> Table:
         return _token_balance_table
@@ -506,18 +538,15 @@ class _TokenBalanceItem(Item):
         return 'tokenBalances'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('tokenBalance'), ['transactionIndex', 'account'])
+        return get_selected_fields(fields.get('tokenBalance'), ('transactionIndex', 'account'))
 
     def project(self, fields: FieldSelection) -> str:
-        return json_project(self.get_selected_fields(fields), rewrite={
-            'preAmount': 'pre_amount::text',
-            'postAmount': 'post_amount::text'
-        })
+        return _token_balance_projection(self.get_selected_fields(fields))
 
 
 _reward_table = Table(
     name='rewards',
-    primary_key=['pubkey']
+    primary_key=('pubkey',)
 )
 
 
@@ -532,6 +561,12 @@ class _RewardScan(Scan):
         yield field_in('pubkey', req.get('pubkey'))
 
 
+_reward_projection = JsonProjection({
+    'lamports': 'lamports::text',
+    'postBalance': 'post_balance::text'
+})
+
+
 class _RewardItem(Item):
     def table(self) -> Table:
         return _reward_table
@@ -540,13 +575,10 @@ class _RewardItem(Item):
         return 'rewards'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('reward'), ['pubkey'])
+        return get_selected_fields(fields.get('reward'), ('pubkey',))
 
     def project(self, fields: FieldSelection) -> str:
-        return json_project(self.get_selected_fields(fields), rewrite={
-            'lamports': 'lamports::text',
-            'postBalance': 'post_balance::text'
-        })
+        return _reward_projection(self.get_selected_fields(fields))
 
 
 def _build_model():
@@ -570,22 +602,22 @@ def _build_model():
         RefRel(
             scan=ins_scan,
             include_flag_name='transaction',
-            scan_columns=['transaction_index'],
+            scan_columns=('transaction_index',),
         ),
         RefRel(
             scan=log_scan,
             include_flag_name='transaction',
-            scan_columns=['transaction_index'],
+            scan_columns=('transaction_index',),
         ),
         RefRel(
             scan=balance_scan,
             include_flag_name='transaction',
-            scan_columns=['transaction_index']
+            scan_columns=('transaction_index',)
         ),
         RefRel(
             scan=token_balance_scan,
             include_flag_name='transaction',
-            scan_columns=['transaction_index']
+            scan_columns=('transaction_index',)
         )
     ])
 
@@ -610,7 +642,7 @@ def _build_model():
         RefRel(
             scan=log_scan,
             include_flag_name='instruction',
-            scan_columns=['transaction_index', 'instruction_address']
+            scan_columns=('transaction_index', 'instruction_address')
         )
     ])
 
@@ -1,17 +1,21 @@
+import functools
 import json
 
 import base58
 import pyarrow
 
 from sqa.fs import Fs
-from sqa.writer.parquet import TableBuilder, Column, BaseParquetWriter, add_index_column, add_size_column
-from .model import BlockHeader, Transaction, Instruction, Block, LogMessage, Balance, TokenBalance, Reward
+from sqa.writer.parquet import TableBuilder, Column, BaseParquetWriter, add_index_column, add_size_column, \
+    sort_table, ParallelWrites
+from .model import BlockHeader, Transaction, Instruction, Block, LogMessage, Balance, TokenBalance, Reward, \
+    AddressTableLookup
 
 
 def base58_bytes():
     return pyarrow.string()
 
 
+@functools.cache
 def address():
     return pyarrow.list_(pyarrow.uint32())
 
@@ -38,6 +42,45 @@ class BlockTable(TableBuilder):
         self.timestamp.append(block['timestamp'])
 
 
+class AddressTableLookupsColumn(Column):
+    """
+    Builds the list of lookup structs from flat per field lists,
+    mapping the camelCase keys of the source objects to struct fields
+    """
+    def __init__(self, chunk_size=1000):
+        super().__init__(pyarrow.list_(
+            pyarrow.struct([
+                ('account_key', base58_bytes()),
+                ('readonly_indexes', pyarrow.list_(pyarrow.uint8())),
+                ('writable_indexes', pyarrow.list_(pyarrow.uint8())),
+            ])
+        ), chunk_size)
+
+    def _new_chunk(self):
+        offsets = [0]
+        account_keys = []
+        readonly_indexes = []
+        writable_indexes = []
+        for lookups in self.buf:
+            for t in lookups:
+                account_keys.append(t['accountKey'])
+                readonly_indexes.append(t['readonlyIndexes'])
+                writable_indexes.append(t['writableIndexes'])
+            offsets.append(len(account_keys))
+        struct_type = self.type.value_type
+        values = pyarrow.StructArray.from_arrays(
+            [
+                pyarrow.array(account_keys, type=struct_type.field(0).type),
+                pyarrow.array(readonly_indexes, type=struct_type.field(1).type),
+                pyarrow.array(writable_indexes, type=struct_type.field(2).type),
+            ],
+            fields=list(struct_type)
+        )
+        a = pyarrow.ListArray.from_arrays(pyarrow.array(offsets, type=pyarrow.int32()), values, type=self.type)
+        self.chunks.append(a)
+        self.buf.clear()
+
+
 class TransactionTable(TableBuilder):
     def __init__(self):
         self.block_number = Column(pyarrow.int32())
@@ -45,13 +88,7 @@ class TransactionTable(TableBuilder):
         self.version = Column(pyarrow.int16())  # -1 = legacy
         # transaction message
         self.account_keys = Column(pyarrow.list_(base58_bytes()))
-        self.address_table_lookups = Column(pyarrow.list_(
-            pyarrow.struct([
-                ('account_key', base58_bytes()),
-                ('readonly_indexes', pyarrow.list_(pyarrow.uint8())),
-                ('writable_indexes', pyarrow.list_(pyarrow.uint8())),
-            ])
-        ))
+        self.address_table_lookups = AddressTableLookupsColumn()
         self.num_readonly_signed_accounts = Column(pyarrow.uint8())
         self.num_readonly_unsigned_accounts = Column(pyarrow.uint8())
         self.num_required_signatures = Column(pyarrow.uint8())
@@ -85,10 +122,7 @@ class TransactionTable(TableBuilder):
 
         address_table_lookups = tx['addressTableLookups']
         self.address_table_lookups.append(address_table_lookups)
-        self.address_table_lookups_size.append(sum(
-            len(t['accountKey']) + len(t['readonlyIndexes']) + len(t['writableIndexes'])
-            for t in address_table_lookups
-        ))
+        self.address_table_lookups_size.append(_address_table_lookups_size(address_table_lookups))
 
         self.num_readonly_signed_accounts.append(tx['numReadonlySignedAccounts'])
         self.num_readonly_unsigned_accounts.append(tx['numReadonlyUnsignedAccounts'])
@@ -113,7 +147,10 @@ class TransactionTable(TableBuilder):
 
         self.has_dropped_log_messages.append(tx['hasDroppedLogMessages'])
 
-        self.fee_payer.append(tx['accountKeys'][0])
+        self.fee_payer.append(account_keys[0])
+
+
+_NO_ACCOUNTS = (None,) * 16
 
 
 class InstructionTable(TableBuilder):
@@ -138,6 +175,13 @@ class InstructionTable(TableBuilder):
         self.a13 = Column(base58_bytes())
         self.a14 = Column(base58_bytes())
         self.a15 = Column(base58_bytes())
+        # bound once, columns are never replaced, only reset
+        self._account_appends = (
+            self.a0.append, self.a1.append, self.a2.append, self.a3.append,
+            self.a4.append, self.a5.append, self.a6.append, self.a7.append,
+            self.a8.append, self.a9.append, self.a10.append, self.a11.append,
+            self.a12.append, self.a13.append, self.a14.append, self.a15.append
+        )
         self.rest_accounts = Column(pyarrow.list_(base58_bytes()))
         self.data = Column(base58_bytes())
 
@@ -161,23 +205,26 @@ class InstructionTable(TableBuilder):
         self.instruction_address.append(i['instructionAddress'])
         self.program_id.append(i['programId'])
         self._set_accounts(i['accounts'])
-        self.data.append(i['data'])
+        data = i['data']
+        self.data.append(data)
 
         self.compute_units_consumed.append(_to_int(i.get('computeUnitsConsumed')))
         self.error.append(i.get('error'))
         self.is_committed.append(i['isCommitted'])
         self.has_dropped_log_messages.append(i['hasDroppedLogMessages'])
 
-        data = base58.b58decode(i['data'])
-        self.d1.append(f'0x{data[:1].hex()}')
-        self.d2.append(f'0x{data[:2].hex()}')
-        self.d4.append(f'0x{data[:4].hex()}')
-        self.d8.append(f'0x{data[:8].hex()}')
+        d1, d2, d4, d8 = _discriminators(_decode_data_prefix(data))
+        self.d1.append(d1)
+        self.d2.append(d2)
+        self.d4.append(d4)
+        self.d8.append(d8)
 
     def _set_accounts(self, accounts: list[str]) -> None:
-        for i in range(16):
-            col = getattr(self, f'a{i}')
-            col.append(accounts[i] if i < len(accounts) else None)
+        fixed = accounts[:16]
+        if len(fixed) < 16:
+            fixed = [*fixed, *_NO_ACCOUNTS[len(fixed):]]
+        for append, account in zip(self._account_appends, fixed):
+            append(account)
         if len(accounts) > 16:
             self.rest_accounts.append(accounts[16:])
         else:
@@ -326,164 +373,166 @@ def write_parquet(fs: Fs, tables: dict[str, pyarrow.Table]) -> None:
         'write_batch_size': 50
     }
 
-    transactions = tables['transactions']
-    transactions = transactions.sort_by([
-        ('fee_payer', 'ascending'),
-        ('block_number', 'ascending'),
-        ('transaction_index', 'ascending'),
-    ])
-    transactions = add_index_column(transactions)
-
-    fs.write_parquet(
-        'transactions.parquet',
-        transactions,
-        use_dictionary=[
-            'account_keys.list.element',
-            'address_table_lookups.list.element.account_key',
-            'loaded_addresses.readonly.list.element',
-            'loaded_addresses.writable.list.element',
-            'fee_payer'
-        ],
-        write_statistics=[
-            '_idx',
-            'fee_payer',
-            'block_number',
-            'transaction_index',
-            'has_dropped_log_messages'
-        ],
-        row_group_size=5_000,
-        **kwargs
-    )
-
-    instructions = tables['instructions']
-    instructions = instructions.sort_by([
-        ('d1', 'ascending'),
-        ('program_id', 'ascending'),
-        ('block_number', 'ascending'),
-        ('transaction_index', 'ascending'),
-        # ('instruction_address', 'ascending')
-    ])
-    instructions = add_size_column(instructions, 'data')
-    instructions = add_index_column(instructions)
-
-    fs.write_parquet(
-        'instructions.parquet',
-        instructions,
-        use_dictionary=[
-            'program_id',
-            'a0', 'a1', 'a2', 'a3', 'a4', 'a5', 'a6', 'a7', 'a8', 'a9', 'a10', 'a11', 'a12', 'a13', 'a14', 'a15',
-            'rest_accounts.list.element',
-            'd1'
-        ],
-        write_statistics=[
-            '_idx',
-            'block_number',
-            'transaction_index',
-            'program_id',
-            'a0', 'a1', 'a2', 'a3', 'a4', 'a5', 'a6', 'a7', 'a8', 'a9', 'a10', 'a11', 'a12', 'a13', 'a14', 'a15',
-            'd1', 'd2', 'd4', 'd8',
-            'has_dropped_log_messages'
-        ],
-        row_group_size=20_000,
-        **kwargs
-    )
-
-    logs = tables['logs']
-    logs = logs.sort_by([
-        ('program_id', 'ascending'),
-        ('kind', 'ascending'),
-        ('block_number', 'ascending'),
-        ('log_index', 'ascending')
-    ])
-    logs = add_size_column(logs, 'message')
-    logs = add_index_column(logs)
-
-    fs.write_parquet(
-        'logs.parquet',
-        logs,
-        use_dictionary=['program_id', 'kind'],
-        write_statistics=[
-            '_idx',
-            'block_number',
-            'transaction_index',
-            'log_index',
-            'program_id',
-            'kind'
-        ],
-        row_group_size=50_000,
-        **kwargs
-    )
-
-    balances = tables['balances']
-    balances = balances.sort_by([
-        ('account', 'ascending'),
-        ('block_number', 'ascending'),
-        ('transaction_index', 'ascending'),
-    ])
-    balances = add_index_column(balances)
+    with ParallelWrites(fs) as files:
+        transactions = tables['transactions']
+        transactions = sort_table(transactions, [
+            ('fee_payer', 'ascending'),
+            ('block_number', 'ascending'),
+            ('transaction_index', 'ascending'),
+        ])
+        transactions = add_index_column(transactions)
+
+        files.write_parquet(
+            'transactions.parquet',
+            transactions,
+            use_dictionary=[
+                'account_keys.list.element',
+                'address_table_lookups.list.element.account_key',
+                'loaded_addresses.readonly.list.element',
+                'loaded_addresses.writable.list.element',
+                'fee_payer'
+            ],
+            write_statistics=[
+                '_idx',
+                'fee_payer',
+                'block_number',
+                'transaction_index',
+                'has_dropped_log_messages'
+            ],
+            row_group_size=5_000,
+            **kwargs
+        )
 
-    fs.write_parquet(
-        'balances.parquet',
-        balances,
-        use_dictionary=['account'],
-        write_statistics=['_idx', 'account', 'block_number', 'transaction_index'],
-        row_group_size=20_000,
-        **kwargs
-    )
+        instructions = tables['instructions']
+        instructions = sort_table(instructions, [
+            ('d1', 'ascending'),
+            ('program_id', 'ascending'),
+            ('block_number', 'ascending'),
+            ('transaction_index', 'ascending'),
+            # ('instruction_address', 'ascending')
+        ])
+        instructions = add_size_column(instructions, 'data')
+        instructions = add_index_column(instructions)
+
+        files.write_parquet(
+            'instructions.parquet',
+            instructions,
+            use_dictionary=[
+                'program_id',
+                'a0', 'a1', 'a2', 'a3', 'a4', 'a5', 'a6', 'a7', 'a8', 'a9', 'a10', 'a11', 'a12', 'a13', 'a14', 'a15',
+                'rest_accounts.list.element',
+                'd1'
+            ],
+            write_statistics=[
+                '_idx',
+                'block_number',
+                'transaction_index',
+                'program_id',
+                'a0', 'a1', 'a2', 'a3', 'a4', 'a5', 'a6', 'a7', 'a8', 'a9', 'a10', 'a11', 'a12', 'a13', 'a14', 'a15',
+                'd1', 'd2', 'd4', 'd8',
+                'has_dropped_log_messages'
+            ],
+            row_group_size=20_000,
+            **kwargs
+        )
 
-    token_balances = tables['token_balances']
-    token_balances = token_balances.sort_by([
-        ('post_program_id', 'ascending'),
-        ('post_mint', 'ascending'),
-        ('account', 'ascending'),
-        ('block_number', 'ascending'),
-        ('transaction_index', 'ascending'),
-    ])
-    token_balances = add_index_column(token_balances)
+        logs = tables['logs']
+        logs = sort_table(logs, [
+            ('program_id', 'ascending'),
+            ('kind', 'ascending'),
+            ('block_number', 'ascending'),
+            ('log_index', 'ascending')
+        ])
+        logs = add_size_column(logs, 'message')
+        logs = add_index_column(logs)
+
+        files.write_parquet(
+            'logs.parquet',
+            logs,
+            use_dictionary=['program_id', 'kind'],
+            write_statistics=[
+                '_idx',
+                'block_number',
+                'transaction_index',
+                'log_index',
+                'program_id',
+                'kind'
+            ],
+            row_group_size=50_000,
+            **kwargs
+        )
 
-    fs.write_parquet(
-        'token_balances.parquet',
-        token_balances,
-        use_dictionary=[
-            'account',
-            'pre_mint',
-            'post_mint',
-            'pre_owner',
-            'post_owner',
-            'pre_program_id',
-            'post_program_id'
-        ],
-        write_statistics=[
-            '_idx',
-            'account',
-            'pre_mint',
-            'post_mint',
-            'pre_owner',
-            'post_owner',
-            'pre_program_id',
-            'post_program_id',
-            'block_number',
-            'transaction_index'
-        ],
-        row_group_size=8_000,
-        **kwargs
-    )
+        balances = tables['balances']
+        balances = sort_table(balances, [
+            ('account', 'ascending'),
+            ('block_number', 'ascending'),
+            ('transaction_index', 'ascending'),
+        ])
+        balances = add_index_column(balances)
+
+        files.write_parquet(
+            'balances.parquet',
+            balances,
+            use_dictionary=['account'],
+            write_statistics=['_idx', 'account', 'block_number', 'transaction_index'],
+            row_group_size=20_000,
+            **kwargs
+        )
 
-    rewards = tables['rewards']
-    rewards = rewards.sort_by([
-        ('pubkey', 'ascending'),
-        ('block_number', 'ascending'),
-    ])
-    rewards = add_index_column(rewards)
+        token_balances = tables['token_balances']
+        token_balances = sort_table(token_balances, [
+            ('post_program_id', 'ascending'),
+            ('post_mint', 'ascending'),
+            ('account', 'ascending'),
+            ('block_number', 'ascending'),
+            ('transaction_index', 'ascending'),
+        ])
+        token_balances = add_index_column(token_balances)
+
+        files.write_parquet(
+            'token_balances.parquet',
+            token_balances,
+            use_dictionary=[
+                'account',
+                'pre_mint',
+                'post_mint',
+                'pre_owner',
+                'post_owner',
+                'pre_program_id',
+                'post_program_id'
+            ],
+            write_statistics=[
+                '_idx',
+                'account',
+                'pre_mint',
+                'post_mint',
+                'pre_owner',
+                'post_owner',
+                'pre_program_id',
+                'post_program_id',
+                'block_number',
+                'transaction_index'
+            ],
+            row_group_size=8_000,
+            **kwargs
+        )
 
-    fs.write_parquet(
-        'rewards.parquet',
-        rewards,
-        use_dictionary=['pubkey', 'reward_type'],
-        write_statistics=['_idx', 'pubkey', 'reward_type', 'block_number'],
-        **kwargs
-    )
+        rewards = tables['rewards']
+        rewards = sort_table(rewards, [
+            ('pubkey', 'ascending'),
+            ('block_number', 'ascending'),
+        ])
+        rewards = add_index_column(rewards)
+
+        files.write_parquet(
+            'rewards.parquet',
+            rewards,
+            use_dictionary=['pubkey', 'reward_type'],
+            write_statistics=['_idx', 'pubkey', 'reward_type', 'block_number'],
+            **kwargs
+        )
 
+    # blocks.parquet marks the chunk as complete, so it is written only after all other tables
     blocks = tables['blocks']
 
     fs.write_parquet(
@@ -493,8 +542,62 @@ def write_parquet(fs: Fs, tables: dict[str, pyarrow.Table]) -> None:
     )
 
 
+_BASE58_ALPHABET = base58.BITCOIN_ALPHABET
+_BASE58_DIGITS = bytes(_BASE58_ALPHABET.find(c) % 256 for c in range(256))
+
+
+def _decode_data_prefix(data: str) -> bytes:
+    """
+    Returns the first 8 bytes of base58 encoded `data`.
+
+    Only the leading digits are decoded when they alone determine the result.
+    """
+    v = data.encode()
+    if v.translate(None, _BASE58_ALPHABET):
+        return base58.b58decode(data)[:8]
+    zeros = len(v) - len(v.lstrip(b'1'))
+    if zeros >= 8:
+        return bytes(8)
+    size = 8 - zeros
+    n = 0
+    for d in v[zeros:zeros + 16].translate(_BASE58_DIGITS):
+        n = n * 58 + d
+    rest = len(v) - zeros - 16
+    if rest > 0:
+        m = 58 ** rest
+        lo = n * m
+        prefix = _top_bytes(lo, size)
+        if prefix == _top_bytes(lo + m - 1, size):
+            return bytes(zeros) + prefix
+        for d in v[zeros + 16:].translate(_BASE58_DIGITS):
+            n = n * 58 + d
+    return bytes(zeros) + _top_bytes(n, size)
+
+
+@functools.lru_cache(maxsize=4096)
+def _discriminators(prefix: bytes) -> tuple[str, str, str, str]:
+    # the same few discriminators repeat across most instructions
+    d8 = prefix.hex()
+    return f'0x{d8[:2]}', f'0x{d8[:4]}', f'0x{d8[:8]}', f'0x{d8}'
+
+
+def _top_bytes(n: int, size: int) -> bytes:
+    byte_len = (n.bit_length() + 7) // 8
+    if byte_len > size:
+        n >>= 8 * (byte_len - size)
+        byte_len = size
+    return n.to_bytes(byte_len, 'big')
+
+
+def _address_table_lookups_size(lookups: list[AddressTableLookup]) -> int:
+    size = 0
+    for t in lookups:
+        size += len(t['accountKey']) + len(t['readonlyIndexes']) + len(t['writableIndexes'])
+    return size
+
+
 def _list_size(ls: list[str]) -> int:
-    return sum(len(i) for i in ls)
+    return len(''.join(ls))
 
 
 def _to_int(val: str | None) -> int | None:
@@ -4,9 +4,9 @@ import marshmallow as mm
 from pyarrow.dataset import Expression
 
 from sqa.query.model import Item, JoinRel, Model, RefRel, Scan, Table
-from sqa.query.schema import BaseQuerySchema
+from sqa.query.schema import BaseQuerySchema, StrList
 from sqa.query.schema import field_map_schema
-from sqa.query.util import field_gte, field_in, field_lte, get_selected_fields, json_project, to_snake_case
+from sqa.query.util import field_gte, field_in, field_lte, get_selected_fields, to_snake_case, JsonProjection
 
 
 class BlockFieldSelection(TypedDict, total=False):
@@ -62,13 +62,13 @@ class TransactionRequest(TypedDict, total=False):
 
 
 class _TransactionRequestSchema(mm.Schema):
-    contractAddress = mm.fields.List(mm.fields.Str())
-    senderAddress = mm.fields.List(mm.fields.Str())
-    type = mm.fields.List(mm.fields.Str())
+    contractAddress = StrList()
+    senderAddress = StrList()
+    type = StrList()
     firstNonce = mm.fields.Integer(
         strict=True,
         validate=mm.validate.Range(min=0, min_inclusive=True)
-    ),
+    )
     lastNonce = mm.fields.Integer(
         strict=True,
         validate=mm.validate.Range(min=0, min_inclusive=True)
@@ -86,11 +86,11 @@ class EventRequest(TypedDict, total=False):
 
 
 class _EventRequestSchema(mm.Schema):
-    fromAddress = mm.fields.List(mm.fields.Str())
-    key0 = mm.fields.List(mm.fields.Str())
-    key1 = mm.fields.List(mm.fields.Str())
-    key2 = mm.fields.List(mm.fields.Str())
-    key3 = mm.fields.List(mm.fields.Str())
+    fromAddress = StrList()
+    key0 = StrList()
+    key1 = StrList()
+    key2 = StrList()
+    key3 = StrList()
     transaction = mm.fields.Boolean()
 
 
@@ -105,13 +105,13 @@ QUERY_SCHEMA = _QuerySchema()
 
 _blocks_table = Table(
     name='blocks',
-    primary_key=[],
+    primary_key=(),
 )
 
 
 _tx_table = Table(
     name='transactions',
-    primary_key=['transaction_index'],
+    primary_key=('transaction_index',),
     column_weights={
         'calldata': 'calldata_size',
         'signature': 'signature_size',
@@ -122,7 +122,7 @@ _tx_table = Table(
 
 _events_table = Table(
     name='events',
-    primary_key=['transaction_index', 'event_index'],
+    primary_key=('transaction_index', 'event_index'),
     column_weights={
         'key0': 'keys_size',
         'key1': 0,
@@ -134,6 +134,11 @@ _events_table = Table(
 )
 
 
+_block_projection = JsonProjection({
+    'timestamp': 'epoch(timestamp)::int64'
+})
+
+
 class _BlockItem(Item):
     def table(self) -> Table:
         return _blocks_table
@@ -142,12 +147,10 @@ class _BlockItem(Item):
         return 'blocks'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('block'), ['number', 'hash'])
+        return get_selected_fields(fields.get('block'), ('number', 'hash'))
 
     def project(self, fields: FieldSelection) -> str:
-        return json_project(self.get_selected_fields(fields), rewrite={
-            'timestamp': 'epoch(timestamp)::int64'
-        })
+        return _block_projection(self.get_selected_fields(fields))
 
 
 class _TxScan(Scan):
@@ -173,7 +176,7 @@ class _TxItem(Item):
         return 'transactions'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('transaction'), ['transactionIndex'])
+        return get_selected_fields(fields.get('transaction'), ('transactionIndex',))
 
 
 class _EventScan(Scan):
@@ -191,6 +194,20 @@ class _EventScan(Scan):
         yield field_in('key3', req.get('key3'))
 
 
+_EVENT_FIELD_COLUMNS = {
+    name: (to_snake_case(name),)
+    for name in ('transactionIndex', 'eventIndex', *EventFieldSelection.__optional_keys__)
+}
+_EVENT_FIELD_COLUMNS['keys'] = ('key0', 'key1', 'key2', 'key3', 'rest_keys')
+
+
+_event_projection = JsonProjection({
+    'keys': 'list_concat(%s, rest_keys)' % ' || '.join(
+        f'CASE WHEN {k} IS NULL THEN [] ELSE [{k}] END' for k in ('key0', 'key1', 'key2', 'key3')
+    )
+})
+
+
 class _EventItem(Item):
     def table(self) -> Table:
         return _events_table
@@ -199,28 +216,13 @@ class _EventItem(Item):
         return 'events'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('event'), ['transactionIndex', 'eventIndex'])
+        return get_selected_fields(fields.get('event'), ('transactionIndex', 'eventIndex'))
 
     def selected_columns(self, fields: FieldSelection) -> list[str]:
-        columns = []
-        for name in self.get_selected_fields(fields):
-            if name == 'keys':
-                columns.append('key0')
-                columns.append('key1')
-                columns.append('key2')
-                columns.append('key3')
-                columns.append('rest_keys')
-            else:
-                columns.append(to_snake_case(name))
-        return columns
+        return [c for name in self.get_selected_fields(fields) for c in _EVENT_FIELD_COLUMNS[name]]
 
     def project(self, fields: FieldSelection) -> str:
-        return json_project(self.get_selected_fields(fields), rewrite={
-            'keys': f'list_concat('
-                    f'[k for k in list_value(key0, key1, key2, key3) if k is not null], '
-                    f'rest_keys'
-                    f')'
-        })
+        return _event_projection(self.get_selected_fields(fields))
 
 
 def _build_model() -> Model:
@@ -247,7 +249,7 @@ def _build_model() -> Model:
         RefRel(
             scan=event_scan,
             include_flag_name='transaction',
-            scan_columns=['transaction_index']
+            scan_columns=('transaction_index',)
         )
     ])
 
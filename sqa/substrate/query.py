@@ -5,7 +5,7 @@ import pyarrow.dataset
 
 from sqa.query.model import Model, JoinRel, RefRel, Table, Item, FieldSelection, Scan, SubRel
 from sqa.query.schema import BaseQuerySchema, field_map_schema
-from sqa.query.util import json_project, get_selected_fields, field_in
+from sqa.query.util import json_project, get_selected_fields, field_in, JsonProjection
 
 
 class BlockFieldSelection(TypedDict, total=False):
@@ -164,7 +164,7 @@ QUERY_SCHEMA = _QuerySchema()
 
 _blocks_table = Table(
     name='blocks',
-    primary_key=[],
+    primary_key=(),
     column_weights={
         'digest': 32 * 4
     }
@@ -173,7 +173,7 @@ _blocks_table = Table(
 
 _events_table = Table(
     name='events',
-    primary_key=['index'],
+    primary_key=('index',),
     column_weights={
         'args': 'args_size'
     }
@@ -182,7 +182,7 @@ _events_table = Table(
 
 _calls_table = Table(
     name='calls',
-    primary_key=['extrinsic_index', 'address'],
+    primary_key=('extrinsic_index', 'address'),
     column_weights={
         'args': 'args_size'
     }
@@ -191,13 +191,18 @@ _calls_table = Table(
 
 _extrinsics_table = Table(
     name='extrinsics',
-    primary_key=['index'],
+    primary_key=('index',),
     column_weights={
         'signature': 4 * 32
     }
 )
 
 
+_block_projection = JsonProjection({
+    'timestamp': 'epoch_ms(timestamp)'
+})
+
+
 class _BlockItem(Item):
     def table(self) -> Table:
         return _blocks_table
@@ -206,18 +211,10 @@ class _BlockItem(Item):
         return 'blocks'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('block'), ['number', 'hash', 'parentHash'])
+        return get_selected_fields(fields.get('block'), ('number', 'hash', 'parentHash'))
 
     def project(self, fields: FieldSelection) -> str:
-        def rewrite_timestamp(f: str):
-            if f == 'timestamp':
-                return 'timestamp', f'epoch_ms(timestamp)'
-            else:
-                return f
-
-        return json_project(
-            map(rewrite_timestamp, self.get_selected_fields(fields))
-        )
+        return _block_projection(self.get_selected_fields(fields))
 
 
 class _EventScan(Scan):
@@ -291,7 +288,7 @@ class _EventItem(Item):
         return 'events'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('event'), ['index', 'extrinsicIndex', 'callAddress'])
+        return get_selected_fields(fields.get('event'), ('index', 'extrinsicIndex', 'callAddress'))
 
     def project(self, fields: FieldSelection) -> str:
         def rewrite(f: str):
@@ -337,7 +334,7 @@ class _CallItem(Item):
         return 'calls'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('call'), ['extrinsicIndex', 'address'])
+        return get_selected_fields(fields.get('call'), ('extrinsicIndex', 'address'))
 
     def project(self, fields: FieldSelection) -> str:
         def rewrite(f: str):
@@ -359,7 +356,7 @@ class _ExtrinsicItem(Item):
         return 'extrinsics'
 
     def get_selected_fields(self, fields: FieldSelection) -> list[str]:
-        return get_selected_fields(fields.get('extrinsic'), ['index'])
+        return get_selected_fields(fields.get('extrinsic'), ('index',))
 
     def project(self, fields: FieldSelection) -> str:
         def rewrite(f: str):
@@ -448,12 +445,12 @@ def _build_model() -> Model:
             RefRel(
                 scan=s,
                 include_flag_name='call',
-                scan_columns=['extrinsic_index', 'call_address']
+                scan_columns=('extrinsic_index', 'call_address')
             ),
             JoinRel(
                 scan=s,
                 include_flag_name='stack',
-                scan_columns=['extrinsic_index', 'call_address'],
+                scan_columns=('extrinsic_index', 'call_address'),
                 query='SELECT * FROM calls i, s WHERE '
                       'i.block_number = s.block_number AND '
                       'i.extrinsic_index = s.extrinsic_index AND '
@@ -467,7 +464,7 @@ def _build_model() -> Model:
             RefRel(
                 scan=s,
                 include_flag_name='extrinsic',
-                scan_columns=['extrinsic_index']
+                scan_columns=('extrinsic_index',)
             ),
         ])
 
@@ -475,7 +472,7 @@ def _build_model() -> Model:
         RefRel(
             scan=call_scan,
             include_flag_name='extrinsic',
-            scan_columns=['extrinsic_index']
+            scan_columns=('extrinsic_index',)
         )
     ])
 
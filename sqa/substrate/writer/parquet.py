@@ -4,7 +4,8 @@ from typing import Any
 import pyarrow
 
 from sqa.fs import Fs
-from sqa.writer.parquet import TableBuilder, Column, BaseParquetWriter, add_size_column, add_index_column
+from sqa.writer.parquet import TableBuilder, Column, BaseParquetWriter, add_size_column, add_index_column, \
+    ParallelWrites
 from .model import BlockHeader, Extrinsic, Call, BigInt, Event, Block
 
 
@@ -200,92 +201,94 @@ def write_parquet(fs: Fs, tables: dict[str, pyarrow.Table]) -> None:
         'write_batch_size': 100
     }
 
-    events = tables['events']
-    events = events.sort_by([
-        ('name', 'ascending'),
-        ('_evm_log_address', 'ascending'),
-        ('_evm_log_topic0', 'ascending'),
-        ('_contract_address', 'ascending'),
-        ('_gear_program_id', 'ascending'),
-        ('block_number', 'ascending'),
-        ('index', 'ascending')
-    ])
-    events = add_size_column(events, 'args')
-    events = add_index_column(events)
-
-    fs.write_parquet(
-        'events.parquet',
-        events,
-        row_group_size=20_000,
-        use_dictionary=[
-            'name',
-            'phase',
-            '_evm_log_address',
-            '_evm_log_topic0',
-            '_contract_address',
-            '_gear_program_id'
-        ],
-        write_statistics=[
-            'block_number',
-            'index',
-            'extrinsic_index',
-            'name',
-            '_evm_log_address',
-            '_evm_log_topic0',
-            '_contract_address',
-            '_gear_program_id',
-            '_idx'
-        ],
-        **kwargs
-    )
-
-    calls = tables['calls']
-    calls = calls.sort_by([
-        ('name', 'ascending'),
-        ('_ethereum_transact_to', 'ascending'),
-        ('_ethereum_transact_sighash', 'ascending'),
-        ('block_number', 'ascending'),
-        ('extrinsic_index', 'ascending')
-    ])
-    calls = add_size_column(calls, 'args')
-    calls = add_index_column(calls)
-
-    fs.write_parquet(
-        'calls.parquet',
-        calls,
-        row_group_size=20_000,
-        use_dictionary=[
-            'name',
-            '_ethereum_transact_to',
-            '_ethereum_transact_sighash'
-        ],
-        write_statistics=[
-            'block_number',
-            'extrinsic_index',
-            'name',
-            '_ethereum_transact_to',
-            '_ethereum_transact_sighash',
-            '_idx'
-        ],
-        **kwargs
-    )
-
-    extrinsics = tables['extrinsics']
-    extrinsics = add_index_column(extrinsics)
-
-    fs.write_parquet(
-        'extrinsics.parquet',
-        extrinsics,
-        use_dictionary=False,
-        write_statistics=[
-            'block_number',
-            'index',
-            'version',
-            '_idx'
-        ],
-        **kwargs
-    )
-
+    with ParallelWrites(fs) as files:
+        events = tables['events']
+        events = events.sort_by([
+            ('name', 'ascending'),
+            ('_evm_log_address', 'ascending'),
+            ('_evm_log_topic0', 'ascending'),
+            ('_contract_address', 'ascending'),
+            ('_gear_program_id', 'ascending'),
+            ('block_number', 'ascending'),
+            ('index', 'ascending')
+        ])
+        events = add_size_column(events, 'args')
+        events = add_index_column(events)
+
+        files.write_parquet(
+            'events.parquet',
+            events,
+            row_group_size=20_000,
+            use_dictionary=[
+                'name',
+                'phase',
+                '_evm_log_address',
+                '_evm_log_topic0',
+                '_contract_address',
+                '_gear_program_id'
+            ],
+            write_statistics=[
+                'block_number',
+                'index',
+                'extrinsic_index',
+                'name',
+                '_evm_log_address',
+                '_evm_log_topic0',
+                '_contract_address',
+                '_gear_program_id',
+                '_idx'
+            ],
+            **kwargs
+        )
+
+        calls = tables['calls']
+        calls = calls.sort_by([
+            ('name', 'ascending'),
+            ('_ethereum_transact_to', 'ascending'),
+            ('_ethereum_transact_sighash', 'ascending'),
+            ('block_number', 'ascending'),
+            ('extrinsic_index', 'ascending')
+        ])
+        calls = add_size_column(calls, 'args')
+        calls = add_index_column(calls)
+
+        files.write_parquet(
+            'calls.parquet',
+            calls,
+            row_group_size=20_000,
+            use_dictionary=[
+                'name',
+                '_ethereum_transact_to',
+                '_ethereum_transact_sighash'
+            ],
+            write_statistics=[
+                'block_number',
+                'extrinsic_index',
+                'name',
+                '_ethereum_transact_to',
+                '_ethereum_transact_sighash',
+                '_idx'
+            ],
+            **kwargs
+        )
+
+        extrinsics = tables['extrinsics']
+        extrinsics = add_index_column(extrinsics)
+
+        files.write_parquet(
+            'extrinsics.parquet',
+            extrinsics,
+            use_dictionary=False,
+            write_statistics=[
+                'block_number',
+                'index',
+                'version',
+                '_idx'
+            ],
+            **kwargs
+        )
+
+    # blocks.parquet marks the chunk as complete, so it is written only after all other tables
     blocks = tables['blocks']
 
     fs.write_parquet(
@@ -1,9 +1,10 @@
+import functools
 import gzip
 import json
 import math
 import time
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from typing import Iterable, Optional, Callable, Any
 
 import marshmallow as mm
 import psutil
@@ -17,7 +18,7 @@ from sqa.fs import LocalFs
 from sqa.layout import get_chunks, get_filelist, Partition
 from sqa.query.model import Model
 from sqa.query.plan import QueryPlan
-from sqa.query.schema import ArchiveQuery
+from sqa.query.schema import ArchiveQuery, compile_schema
 from .state.intervals import Range
 from .util import sha3_256
 
@@ -58,11 +59,16 @@ def validate_query(q) -> ArchiveQuery:
 
 def _validate_shape(obj, schema: mm.Schema):
     try:
-        return schema.load(obj, unknown=mm.RAISE)
+        return _get_loader(schema)(obj)
     except mm.ValidationError as err:
         raise InvalidQuery(str(err.normalized_messages()))
 
 
+@functools.cache
+def _get_loader(schema: mm.Schema) -> Callable[[Any], dict]:
+    return compile_schema(schema)
+
+
 def _get_query_size(query: ArchiveQuery) -> int:
     size = 0
     for item in query.values():
@@ -3,6 +3,7 @@ from functools import cached_property
 from typing import Union, Any
 
 import pyarrow
+import pyarrow.compute
 
 from sqa.duckdb import execute_sql
 from sqa.fs import Fs
@@ -73,6 +74,57 @@ class TableBuilder:
 _WRITE_POOL = concurrent.futures.ThreadPoolExecutor(thread_name_prefix='parquet_writer')
 
 
+_FILE_WRITE_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=8,
+    thread_name_prefix='parquet_file_writer'
+)
+
+
+class ParallelWrites:
+    """
+    Encodes and uploads parquet files of a chunk concurrently.
+
+    Must be used as a context manager, which doesn't exit until all submitted writes are settled.
+    The first failed write cancels the pending ones and is re-raised.
+
+    Submitted tables are held until the block exits,
+    so all tables of a chunk stay in memory until every write is finished.
+    """
+    def __init__(self, fs: Fs):
+        self._fs = fs
+        self._futures: list[concurrent.futures.Future] = []
+
+    def __enter__(self) -> 'ParallelWrites':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self._wait()
+        else:
+            self._cancel()
+
+    def write_parquet(self, dest: str, table: pyarrow.Table, **kwargs) -> None:
+        self._futures.append(
+            _FILE_WRITE_POOL.submit(self._fs.write_parquet, dest, table, **kwargs)
+        )
+
+    def _wait(self) -> None:
+        done, pending = concurrent.futures.wait(
+            self._futures,
+            return_when=concurrent.futures.FIRST_EXCEPTION
+        )
+        if pending:
+            self._cancel()
+        for f in done:
+            f.result()
+
+    def _cancel(self) -> None:
+        for f in self._futures:
+            f.cancel()
+        # writes which are already running can't be cancelled
+        concurrent.futures.wait(self._futures)
+
+
 class BaseParquetWriter(Writer):
     @cached_property
     def _tables(self) -> dict[str, TableBuilder]:
@@ -126,8 +178,12 @@ class BaseParquetWriter(Writer):
 
 
 def add_size_column(table: pyarrow.Table, col: str) -> pyarrow.Table:
-    sizes = execute_sql(f'SELECT coalesce(strlen("{col}")::int8, 0) FROM "table"')
-    return table.append_column(f'{col}_size', sizes.column(0))
+    column = table.column(col)
+    if pyarrow.types.is_string(column.type):
+        sizes = pyarrow.compute.binary_length(column).cast(pyarrow.int64()).fill_null(0)
+    else:
+        sizes = execute_sql(f'SELECT coalesce(strlen("{col}")::int8, 0) FROM "table"').column(0)
+    return table.append_column(f'{col}_size', sizes)
 
 
 def _get_size(v):
@@ -138,8 +194,23 @@ def _get_size(v):
 
 
 def add_index_column(table: pyarrow.Table) -> pyarrow.Table:
-    index = pyarrow.array(
-        range(0, table.shape[0]),
-        type=pyarrow.int32()
-    )
+    ones = pyarrow.nulls(table.shape[0], pyarrow.int32()).fill_null(1)
+    index = pyarrow.compute.cumulative_sum(ones, start=-1)
     return table.append_column('_idx', index)
+
+
+def sort_table(table: pyarrow.Table, sort_keys: list[tuple[str, str]]) -> pyarrow.Table:
+    """
+    Same as `table.sort_by(sort_keys)`, but string keys are compared
+    by the rank of their value in the column's dictionary.
+    """
+    keys = {}
+    for name, _order in sort_keys:
+        col = table.column(name)
+        if pyarrow.types.is_string(col.type):
+            col = col.combine_chunks().dictionary_encode()
+            rank = pyarrow.compute.rank(col.dictionary, 'ascending')
+            col = rank.take(col.indices)
+        keys[name] = col
+    indices = pyarrow.compute.sort_indices(pyarrow.table(keys), sort_keys)
+    return table.take(indices)
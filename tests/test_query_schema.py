@@ -0,0 +1,103 @@
+import copy
+import glob
+import json
+import os
+from typing import Any, Callable, Iterable
+
+import marshmallow as mm
+import pytest
+
+import sqa.eth.query
+import sqa.fuel.query
+import sqa.solana.query
+import sqa.starknet.query
+import sqa.substrate.query
+from sqa.query.schema import compile_schema, _compile_schema
+
+
+SCHEMAS = {
+    'eth': sqa.eth.query.QUERY_SCHEMA,
+    'substrate': sqa.substrate.query.QUERY_SCHEMA,
+    'starknet': sqa.starknet.query.QUERY_SCHEMA,
+    'solana': sqa.solana.query.QUERY_SCHEMA,
+    'fuel': sqa.fuel.query.QUERY_SCHEMA,
+}
+
+
+def _fixture_queries() -> list[Any]:
+    tests_dir = os.path.dirname(__file__)
+    queries = []
+    for file in sorted(glob.glob('*/fixtures/*/query.json', root_dir=tests_dir)):
+        with open(os.path.join(tests_dir, file)) as f:
+            queries.append(pytest.param(json.load(f), id=os.path.dirname(file)))
+    return queries
+
+
+def _variants(q: dict) -> Iterable[Any]:
+    yield q
+    yield [q]
+    yield {**q, 'foo': 1}
+    yield {**q, 'fromBlock': str(q['fromBlock'])}
+    yield {**q, 'fromBlock': -1}
+    yield {**q, 'fromBlock': 1.5}
+    yield {**q, 'toBlock': -1}
+    yield {**q, 'includeAllBlocks': 1}
+    yield {k: v for k, v in q.items() if k != 'fromBlock'}
+
+    fields = q.get('fields', {})
+    yield {**q, 'fields': []}
+    for item, selection in fields.items():
+        yield {**q, 'fields': {**fields, item: {**selection, 'foo': True}}}
+        for name in selection:
+            yield {**q, 'fields': {**fields, item: {**selection, name: 1}}}
+            break
+    yield {**q, 'fields': {**fields, 'foo': {}}}
+
+    for key, requests in q.items():
+        if not isinstance(requests, list):
+            continue
+        yield {**q, key: {}}
+        yield {**q, key: [*requests, 1]}
+        if not requests:
+            continue
+        req = requests[0]
+        yield {**q, key: [{**req, 'foo': True}, *requests[1:]]}
+        for name, value in req.items():
+            if isinstance(value, list):
+                yield {**q, key: [{**req, name: 'foo'}, *requests[1:]]}
+                yield {**q, key: [{**req, name: [*value, 3, None]}, *requests[1:]]}
+                yield {**q, key: [{**req, name: []}, *requests[1:]]}
+            elif isinstance(value, bool):
+                yield {**q, key: [{**req, name: 'true'}, *requests[1:]]}
+
+
+def _result(load: Callable[[Any], dict], q: Any) -> tuple[str, str]:
+    try:
+        # field order decides the order of output properties, so compare it too
+        return 'ok', json.dumps(load(copy.deepcopy(q)))
+    except mm.ValidationError as err:
+        return 'error', json.dumps(err.normalized_messages(), default=str)
+
+
+@pytest.mark.parametrize('schema', SCHEMAS.values(), ids=SCHEMAS.keys())
+def test_schema_is_compiled(schema):
+    assert _compile_schema(schema) is not None
+
+
+@pytest.mark.parametrize('query', _fixture_queries())
+def test_fixture_query_takes_fast_path(query):
+    schema = SCHEMAS[query.get('type', 'eth')]
+    fast_load = _compile_schema(schema)
+    assert _result(fast_load, query) == _result(lambda d: schema.load(d, unknown=mm.RAISE), query)
+
+
+@pytest.mark.parametrize('query', _fixture_queries())
+def test_compiled_schema_matches_marshmallow(query):
+    schema = SCHEMAS[query.get('type', 'eth')]
+    load = compile_schema(schema)
+    n_ok = 0
+    for q in _variants(query):
+        expected = _result(lambda d: schema.load(d, unknown=mm.RAISE), q)
+        assert _result(load, q) == expected, q
+        n_ok += expected[0] == 'ok'
+    assert n_ok > 0
@@ -0,0 +1,50 @@
+import marshmallow as mm
+import pytest
+
+from sqa.solana.query import QUERY_SCHEMA
+from sqa.worker.query import validate_query, InvalidQuery
+
+
+def _query(program_ids: list[str]) -> dict:
+    return {
+        'type': 'solana',
+        'fromBlock': 0,
+        'instructions': [{'programId': program_ids}]
+    }
+
+
+@pytest.mark.parametrize('program_ids', [
+    [],
+    ['2' * 32],
+    ['z' * 44],
+    ['11111111111111111111111111111111'],
+    ['TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA', 'ComputeBudget111111111111111111111111111111'],
+    ['2' * 32, 'z' * 44],
+])
+def test_valid_program_ids(program_ids):
+    q = validate_query(_query(program_ids))
+    assert q['instructions'] == [{'programId': program_ids}]
+
+
+@pytest.mark.parametrize('program_ids, message', [
+    (['2' * 31], 'list contains strings which are not valid base58 encoded public keys'),
+    (['z' * 45], 'list contains strings which are not valid base58 encoded public keys'),
+    (['2' * 32, 'z' * 45], 'list contains strings which are not valid base58 encoded public keys'),
+    (['2' * 31, 'z' * 44], 'list contains strings which are not valid base58 encoded public keys'),
+    ([''], 'list contains strings which are not valid base58 encoded public keys'),
+    (['0' + '2' * 31], 'list contains invalid base58 strings'),
+    (['O' + '2' * 31], 'list contains invalid base58 strings'),
+    (['I' + '2' * 31], 'list contains invalid base58 strings'),
+    (['l' + '2' * 31], 'list contains invalid base58 strings'),
+    (['2' * 32, '2' * 31 + 'l'], 'list contains invalid base58 strings'),
+    (['2' * 31 + ' '], 'list contains invalid base58 strings'),
+    (['2' * 31 + 'é'], 'list contains invalid base58 strings'),
+])
+def test_invalid_program_ids(program_ids, message):
+    with pytest.raises(mm.ValidationError) as error:
+        QUERY_SCHEMA.load(_query(program_ids))
+    assert error.value.normalized_messages() == {
+        'instructions': {0: {'programId': [message]}}
+    }
+    with pytest.raises(InvalidQuery):
+        validate_query(_query(program_ids))
@@ -0,0 +1,173 @@
+import os
+import random
+import time
+
+import base58
+import pyarrow
+import pytest
+
+from sqa.fs import LocalFs
+from sqa.solana.writer.parquet import _decode_data_prefix, AddressTableLookupsColumn, ParquetWriter, \
+    write_parquet
+
+
+def _b58(data: bytes) -> str:
+    return base58.b58encode(data).decode()
+
+
+def _decode_or_error(data: str):
+    try:
+        return base58.b58decode(data)[:8]
+    except Exception as e:
+        return type(e)
+
+
+def _random_data(rnd: random.Random, size: int) -> bytes:
+    zeros = rnd.choice([0, 0, 0, 1, 2, 7, 8, 9])
+    return bytes(zeros) + rnd.randbytes(size)
+
+
+@pytest.mark.parametrize('data', [
+    '',
+    '1',
+    '11111111',
+    '1' * 20,
+    '2',
+    'z',
+    '1z',
+    '11111111z',
+    '1111111z',
+    _b58(b'\x01'),
+    _b58(bytes(7) + b'\xff'),
+    _b58(b'\xff' * 7),
+    _b58(b'\xff' * 8),
+    _b58(b'\xff' * 9),
+    _b58(b'\x00\x01' + b'\xff' * 20),
+    _b58(bytes(range(256))),
+    _b58(b'\xff' * 1024),
+    'z' * 11,
+    'z' * 16,
+    'z' * 17,
+    'z' * 100,
+    '0',
+    'O',
+    'I',
+    'l',
+    '2l',
+    'zzzz0zzzz',
+    '1' * 10 + 'I',
+    '3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy0',
+    'é',
+    ' 2',
+])
+def test_decode_data_prefix(data):
+    expected = _decode_or_error(data)
+    if isinstance(expected, type):
+        with pytest.raises(Exception) as error:
+            _decode_data_prefix(data)
+        assert type(error.value) is expected
+    else:
+        assert _decode_data_prefix(data) == expected
+
+
+def test_decode_data_prefix_random():
+    rnd = random.Random(0)
+    for _ in range(2000):
+        data = _b58(_random_data(rnd, rnd.randrange(0, 64)))
+        assert _decode_data_prefix(data) == base58.b58decode(data)[:8], data
+
+
+
+def _lookup(account_key: str, readonly: list[int], writable: list[int]) -> dict:
+    return {'accountKey': account_key, 'readonlyIndexes': readonly, 'writableIndexes': writable}
+
+
+def _stored(account_key: str, readonly: list[int], writable: list[int]) -> dict:
+    return {'account_key': account_key, 'readonly_indexes': readonly, 'writable_indexes': writable}
+
+
+def test_address_table_lookups_column():
+    column = AddressTableLookupsColumn(chunk_size=2)
+    column.append([_lookup('A', [1, 2], [3])])
+    column.append([])
+    column.append([_lookup('B', [], [0, 255]), _lookup('C', [4], [])])
+    column.append([_lookup('D', [5], [6])])
+    column.append([])
+
+    array = column.build()
+    assert isinstance(array, pyarrow.ChunkedArray)
+    assert array.num_chunks == 3
+    assert array.type == column.type
+    assert array.to_pylist() == [
+        [_stored('A', [1, 2], [3])],
+        [],
+        [_stored('B', [], [0, 255]), _stored('C', [4], [])],
+        [_stored('D', [5], [6])],
+        [],
+    ]
+
+    column.reset()
+    column.append([_lookup('E', [7], [8])])
+    assert column.build().to_pylist() == [[_stored('E', [7], [8])]]
+
+    column.reset()
+    assert column.build().to_pylist() == []
+
+
+class _RecordingFs:
+    def __init__(self, fail: str | None = None):
+        self.fail = fail
+        self.written = []
+
+    def write_parquet(self, dest: str, table: pyarrow.Table, **kwargs) -> None:
+        if dest == self.fail:
+            raise IOError(f'failed to write {dest}')
+        time.sleep(0.01)
+        self.written.append(dest)
+
+
+def _empty_tables() -> dict[str, pyarrow.Table]:
+    return {name: t.to_table() for name, t in ParquetWriter()._tables.items()}
+
+
+def test_write_parquet_writes_blocks_last():
+    fs = _RecordingFs()
+    write_parquet(fs, _empty_tables())
+    assert sorted(fs.written) == sorted(f'{name}.parquet' for name in _empty_tables())
+    assert fs.written[-1] == 'blocks.parquet'
+
+
+@pytest.mark.parametrize('table', ['transactions', 'instructions', 'logs', 'rewards'])
+def test_write_parquet_failure_skips_blocks(table):
+    fs = _RecordingFs(fail=f'{table}.parquet')
+    with pytest.raises(IOError, match=f'failed to write {table}.parquet'):
+        write_parquet(fs, _empty_tables())
+    assert 'blocks.parquet' not in fs.written
+
+
+def _broken_logs(tables: dict[str, pyarrow.Table]) -> dict[str, pyarrow.Table]:
+    return {**tables, 'logs': pyarrow.table({'foo': pyarrow.array([], type=pyarrow.int32())})}
+
+
+@pytest.mark.parametrize('fail_write, make_tables', [
+    ('logs.parquet', _empty_tables),
+    (None, lambda: _broken_logs(_empty_tables())),
+], ids=['write_error', 'sort_error'])
+def test_write_parquet_failure_leaves_no_chunk(tmp_path, monkeypatch, fail_write, make_tables):
+    local_write = LocalFs.write_parquet
+
+    def write(self, dest, table, **kwargs):
+        if dest == fail_write:
+            raise IOError(f'failed to write {dest}')
+        time.sleep(0.05)
+        local_write(self, dest, table, **kwargs)
+
+    monkeypatch.setattr(LocalFs, 'write_parquet', write)
+
+    fs = LocalFs(str(tmp_path))
+    with pytest.raises((IOError, KeyError)):
+        with fs.transact('chunk') as chunk_fs:
+            write_parquet(chunk_fs, make_tables())
+    # writes still running after the failure must not recreate the removed temp dir
+    time.sleep(0.2)
+    assert os.listdir(tmp_path) == []
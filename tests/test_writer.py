@@ -0,0 +1,118 @@
+import random
+import threading
+import time
+
+import pyarrow
+import pytest
+
+from sqa.writer.parquet import sort_table, ParallelWrites
+
+
+def _random_table(rnd: random.Random, n_chunks: int, chunk_size: int) -> pyarrow.Table:
+    def maybe_null(v):
+        return None if rnd.random() < 0.1 else v
+
+    chunks = []
+    for i in range(n_chunks):
+        chunks.append(pyarrow.table({
+            'name': pyarrow.array(
+                [maybe_null(rnd.choice(['', 'a', 'b', 'B', 'ab', 'é', 'z' * 20])) for _ in range(chunk_size)],
+                type=pyarrow.string()
+            ),
+            'program': pyarrow.array(
+                [maybe_null('0x%02x' % rnd.randrange(8)) for _ in range(chunk_size)],
+                type=pyarrow.string()
+            ),
+            'block_number': pyarrow.array(
+                [maybe_null(rnd.randrange(4)) for _ in range(chunk_size)],
+                type=pyarrow.int32()
+            ),
+            'flag': pyarrow.array(
+                [maybe_null(rnd.random() < 0.5) for _ in range(chunk_size)],
+                type=pyarrow.bool_()
+            ),
+            'row': pyarrow.array(range(i * chunk_size, (i + 1) * chunk_size), type=pyarrow.int64())
+        }))
+    return pyarrow.concat_tables(chunks)
+
+
+@pytest.mark.parametrize('sort_keys', [
+    [('name', 'ascending')],
+    [('name', 'descending')],
+    [('block_number', 'ascending')],
+    [('name', 'ascending'), ('block_number', 'ascending')],
+    [('program', 'ascending'), ('name', 'descending'), ('block_number', 'ascending')],
+    [('flag', 'ascending'), ('program', 'ascending'), ('name', 'ascending')],
+    [('block_number', 'descending'), ('program', 'ascending'), ('flag', 'descending')],
+])
+@pytest.mark.parametrize('n_chunks, chunk_size', [(1, 0), (1, 1), (1, 50), (4, 200)])
+def test_sort_table(sort_keys, n_chunks, chunk_size):
+    table = _random_table(random.Random(n_chunks * 1000 + chunk_size), n_chunks, chunk_size)
+    assert table.column('name').num_chunks == n_chunks
+    assert sort_table(table, sort_keys).equals(table.sort_by(sort_keys))
+
+
+def test_sort_table_all_null_keys():
+    table = pyarrow.table({
+        'name': pyarrow.chunked_array([[None, None], [None]], type=pyarrow.string()),
+        'row': [0, 1, 2]
+    })
+    keys = [('name', 'ascending'), ('row', 'descending')]
+    assert sort_table(table, keys).equals(table.sort_by(keys))
+
+
+class _Fs:
+    def __init__(self, fail: tuple[str, ...] = (), delay: float = 0):
+        self.fail = fail
+        self.delay = delay
+        self.written = []
+        self.running = 0
+        self.lock = threading.Lock()
+
+    def write_parquet(self, dest: str, table: pyarrow.Table, **kwargs) -> None:
+        with self.lock:
+            self.running += 1
+        try:
+            time.sleep(0 if dest in self.fail else self.delay)
+            if dest in self.fail:
+                raise IOError(f'failed to write {dest}')
+            with self.lock:
+                self.written.append(dest)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+_TABLE = pyarrow.table({'a': [1, 2, 3]})
+
+
+def test_parallel_writes():
+    fs = _Fs(delay=0.01)
+    files = [f'{i}.parquet' for i in range(20)]
+    with ParallelWrites(fs) as writes:
+        for f in files:
+            writes.write_parquet(f, _TABLE)
+    assert sorted(fs.written) == sorted(files)
+
+
+def test_parallel_writes_failure():
+    fs = _Fs(fail=('1.parquet',), delay=0.2)
+    files = [f'{i}.parquet' for i in range(40)]
+    with pytest.raises(IOError, match='failed to write 1.parquet'):
+        with ParallelWrites(fs) as writes:
+            for f in files:
+                writes.write_parquet(f, _TABLE)
+    assert fs.running == 0
+    assert '1.parquet' not in fs.written
+    assert len(fs.written) < len(files) - 1  # queued writes were cancelled
+
+
+def test_parallel_writes_error_in_block():
+    fs = _Fs(delay=0.2)
+    with pytest.raises(ValueError, match='boom'):
+        with ParallelWrites(fs) as writes:
+            writes.write_parquet('0.parquet', _TABLE)
+            time.sleep(0.05)
+            raise ValueError('boom')
+    assert fs.running == 0
+    assert fs.written == ['0.parquet']